@@ -2,6 +2,11 @@ from .core import GenericChunker
 from .analyzer import TransitionAnalyzer, create_openai_caller
 from .prompts import get_default_prompt, get_legal_prompt
 from .prompt_builder import PromptBuilder
+from .jobs import JobQueue, run_worker
+from .analysis import save_analysis, load_analysis
+from .balancer import LoadBalancedCaller
+from .dedup import NearDuplicateIndex
+from .normalizer import TextNormalizer
 
 __all__ = [
     "GenericChunker",
@@ -9,6 +14,13 @@ __all__ = [
     "create_openai_caller",
     "get_default_prompt",
     "get_legal_prompt",
-    "PromptBuilder"
+    "PromptBuilder",
+    "JobQueue",
+    "run_worker",
+    "save_analysis",
+    "load_analysis",
+    "LoadBalancedCaller",
+    "NearDuplicateIndex",
+    "TextNormalizer"
 ]
 
@@ -0,0 +1,39 @@
+"""
+Persistence helpers for raw analysis artifacts.
+
+An analysis artifact (see GenericChunker.analyze) holds everything the
+filtering pipeline needs, so saved artifacts can be re-chunked with other
+thresholds offline via GenericChunker.rechunk, without any LLM calls.
+"""
+import json
+from typing import Any, Dict
+
+ANALYSIS_VERSION = 1
+
+
+def save_analysis(analysis: Dict[str, Any], path: str) -> None:
+    """
+    Save an analysis artifact as JSON.
+
+    Args:
+        analysis: Artifact from GenericChunker.analyze() or split_text(..., return_analysis=True).
+        path: Output file path.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(analysis, f, ensure_ascii=False)
+
+
+def load_analysis(path: str) -> Dict[str, Any]:
+    """
+    Load an analysis artifact saved with save_analysis().
+
+    Raises:
+        ValueError: If the artifact was written by an incompatible version.
+    """
+    with open(path, encoding="utf-8") as f:
+        analysis = json.load(f)
+
+    version = analysis.get("version")
+    if version != ANALYSIS_VERSION:
+        raise ValueError(f"Unsupported analysis version: {version} (expected {ANALYSIS_VERSION})")
+    return analysis
@@ -2,8 +2,11 @@ import json
 import time
 import os
 import logging
-from typing import Dict, Any, Callable, Optional
+import threading
+from typing import Dict, Any, Callable, List, Optional, Tuple
 from llm_chunker.prompts import get_default_prompt
+from llm_chunker.balancer import LoadBalancedCaller, STRATEGY_LEAST_OUTSTANDING
+from llm_chunker.dedup import NearDuplicateIndex
 
 # Try to import json_repair for robust JSON parsing
 try:
@@ -22,12 +25,22 @@ except ImportError:
     HAS_OPENAI = False
 
 
-def create_openai_caller(model: str = "gpt-5-nano") -> Callable[[str], str]:
+def create_openai_caller(model: str = "gpt-5-nano",
+                         base_url: Optional[str] = None,
+                         api_key: Optional[str] = None,
+                         timeout: Optional[float] = None,
+                         max_retries: Optional[int] = None) -> Callable[[str], str]:
     """
     Factory function to create an OpenAI LLM caller with a specific model.
     
     Args:
         model: The OpenAI model to use (e.g., "gpt-4o", "gpt-5-nano", "gpt-3.5-turbo")
+        base_url: OpenAI-compatible endpoint (e.g., "http://10.0.0.5:8000/v1").
+                  If None, uses the default OpenAI endpoint.
+        api_key: API key. If None, uses env var OPENAI_API_KEY
+                 (optional for custom base_url endpoints).
+        timeout: Request timeout in seconds. If None, uses the client default.
+        max_retries: Client-level retries. If None, uses the client default.
     
     Returns:
         Callable[[str], str]: A function that takes a prompt and returns the LLM response.
@@ -38,18 +51,37 @@ def create_openai_caller(model: str = "gpt-5-nano") -> Callable[[str], str]:
         ...     llm_caller=create_openai_caller("gpt-5-nano")
         ... )
     """
+    clients = []  # Lazily created client, reused across calls (connection pooling)
+
+    def get_client():
+        if clients:
+            return clients[0]
+
+        key = api_key or os.environ.get("OPENAI_API_KEY")
+        if not key:
+            if base_url is None:
+                raise ValueError(
+                    "OPENAI_API_KEY environment variable is not set.\n"
+                    "Set it via: export OPENAI_API_KEY='your-key'\n"
+                )
+            # Self-hosted OpenAI-compatible servers usually ignore the key
+            key = "EMPTY"
+
+        client_kwargs = {"api_key": key}
+        if base_url is not None:
+            client_kwargs["base_url"] = base_url
+        if timeout is not None:
+            client_kwargs["timeout"] = timeout
+        if max_retries is not None:
+            client_kwargs["max_retries"] = max_retries
+        clients.append(OpenAI(**client_kwargs))
+        return clients[0]
+
     def caller(prompt: str) -> str:
         if not HAS_OPENAI:
             raise ImportError("OpenAI library is not installed. Please run 'pip install openai'.")
 
-        api_key = os.environ.get("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError(
-                "OPENAI_API_KEY environment variable is not set.\n"
-                "Set it via: export OPENAI_API_KEY='your-key'\n"
-            )
-
-        client = OpenAI(api_key=api_key)
+        client = get_client()
 
         try:
             logger.debug(f"  LLM 요청 중... (모델: {model})")
@@ -113,10 +145,28 @@ def _extract_transition_points(data: Dict[str, Any]) -> Dict[str, Any]:
     return {"transition_points": data.get("transition_points", [])}
 
 
+# Tier names used for call accounting in cascade mode
+PRIMARY_TIER = "primary"
+ESCALATION_TIER = "escalation"
+
+
+def new_stats() -> Dict[str, Any]:
+    """Create an empty call statistics record (see TransitionAnalyzer.get_stats)."""
+    return {
+        "call_counts": {PRIMARY_TIER: 0, ESCALATION_TIER: 0},
+        "escalation_reasons": {},
+        "near_duplicate_hits": 0,
+    }
+
+
 class TransitionAnalyzer:
     def __init__(self,
                  prompt_generator: Optional[Callable[[str], str]] = None,
-                 model: Optional[str] = None):
+                 model: Optional[str] = None,
+                 escalation_model: Optional[str] = None,
+                 base_urls: Optional[List[str]] = None,
+                 balancing_strategy: str = STRATEGY_LEAST_OUTSTANDING,
+                 dedup_index: Optional[NearDuplicateIndex] = None):
         """
         Initialize the TransitionAnalyzer.
 
@@ -125,6 +175,15 @@ class TransitionAnalyzer:
                               If None, uses get_default_prompt.
             model: OpenAI model name (e.g., "gpt-4o", "gpt-5-nano").
                    If None, uses env var OPENAI_MODEL or defaults to "gpt-4o".
+            escalation_model: Stronger model for cascade mode. When set, every segment
+                              is analyzed with 'model' first and only re-analyzed with
+                              this model when an escalation criterion fires.
+            base_urls: OpenAI-compatible endpoints to load-balance over (both tiers).
+                       If None, uses the default OpenAI endpoint.
+            balancing_strategy: "least_outstanding" or "latency" (see LoadBalancedCaller).
+            dedup_index: NearDuplicateIndex. If given, segments that closely match an
+                         already analyzed segment reuse its transition points
+                         instead of calling the LLM.
 
         Examples:
             # Simplest usage (env var OPENAI_MODEL or gpt-4o)
@@ -138,44 +197,195 @@ class TransitionAnalyzer:
             ...     prompt_generator=get_legal_prompt,
             ...     model="gpt-4o"
             ... )
+
+            # Cascade: cheap model first, escalate low-confidence segments
+            >>> analyzer = TransitionAnalyzer(
+            ...     model="gpt-5-nano",
+            ...     escalation_model="gpt-4o"
+            ... )
+
+            # Spread calls over self-hosted replicas
+            >>> analyzer = TransitionAnalyzer(
+            ...     model="Qwen/Qwen2.5-7B-Instruct",
+            ...     base_urls=["http://gpu1:8000/v1", "http://gpu2:8000/v1"]
+            ... )
         """
         self.prompt_generator = prompt_generator or get_default_prompt
 
-        if model:
+        if base_urls:
+            self.llm_caller = LoadBalancedCaller(
+                base_urls,
+                model=model or os.environ.get("OPENAI_MODEL", "gpt-4o"),
+                strategy=balancing_strategy
+            )
+        elif model:
             self.llm_caller = create_openai_caller(model=model)
         else:
             self.llm_caller = DEFAULT_LLM_CALLER
 
-    def analyze_segment(self, segment: str) -> Dict[str, Any]:
-        prompt = self.prompt_generator(segment)
+        if escalation_model and base_urls:
+            self.escalation_llm_caller = LoadBalancedCaller(
+                base_urls,
+                model=escalation_model,
+                strategy=balancing_strategy
+            )
+        elif escalation_model:
+            self.escalation_llm_caller = create_openai_caller(model=escalation_model)
+        else:
+            self.escalation_llm_caller = None
 
-        for attempt in range(3):
-            try:
-                raw_response = self.llm_caller(prompt)
-                cleaned_json = sanitize_json_output(raw_response)
+        self.dedup_index = dedup_index
+        self._stats_lock = threading.Lock()
+        self.reset_stats()
 
-                try:
-                    if HAS_JSON_REPAIR:
-                        data = json_repair.loads(cleaned_json)
-                    else:
-                        data = json.loads(cleaned_json)
-                    result = _extract_transition_points(data)
+    @property
+    def cascade_enabled(self) -> bool:
+        """True if an escalation tier is configured."""
+        return self.escalation_llm_caller is not None
 
-                    tp_count = len(result['transition_points'])
-                    logger.info(f"  → LLM 응답: {tp_count}개 전환점 발견")
+    def reset_stats(self) -> None:
+        """Reset the cumulative call statistics."""
+        with self._stats_lock:
+            self._stats = new_stats()
 
-                    for i, tp in enumerate(result['transition_points']):
-                        logger.debug(f"    [{i+1}] sig={tp.get('significance', '?')} | '{tp.get('start_text', '')[:25]}...'")
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Return cumulative call statistics since creation or the last reset_stats().
 
-                    return result
+        Returns:
+            Dict with 'call_counts' (LLM requests per tier, retries included),
+            'escalation_reasons' (escalated segments per reason) and
+            'near_duplicate_hits' (segments answered from the dedup index).
+        """
+        with self._stats_lock:
+            return {
+                "call_counts": dict(self._stats["call_counts"]),
+                "escalation_reasons": dict(self._stats["escalation_reasons"]),
+                "near_duplicate_hits": self._stats["near_duplicate_hits"],
+            }
+
+    def _record(self, stats: Optional[Dict[str, Any]], field: str, key: Optional[str] = None) -> None:
+        """Increment a counter in the cumulative stats and the per-call stats (if given)."""
+        with self._stats_lock:
+            for target in (self._stats, stats):
+                if target is None:
+                    continue
+                if key is None:
+                    target[field] += 1
+                else:
+                    target[field][key] = target[field].get(key, 0) + 1
+
+    def analyze_segment(self,
+                        segment: str,
+                        escalate_reason: Optional[str] = None,
+                        stats: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Analyze a segment and return its transition points.
+
+        Args:
+            segment: Text segment to analyze.
+            escalate_reason: If given (and cascade mode is enabled), skip the primary
+                             tier and analyze with the escalation model. The reason is
+                             recorded in the escalation statistics.
+            stats: Per-call statistics record (from new_stats()) updated in addition
+                   to the cumulative statistics.
+
+        Returns:
+            Dict with 'transition_points' and 'tier' (the tier that produced the result).
+            If every LLM attempt failed, 'transition_points' is empty and 'failed' is True.
+        """
+        sig = None
+        if self.dedup_index is not None and not escalate_reason:
+            sig = self.dedup_index.signature(segment)
+            reused = self.dedup_index.lookup(segment, sig)
+            if reused is not None:
+                self._record(stats, "near_duplicate_hits")
+                logger.info(f"  ≈ 유사 세그먼트 결과 재사용 (유사도: {reused['similarity']:.2f}, "
+                            f"{len(reused['transition_points'])}개 전환점)")
+                return reused
 
-                except (json.JSONDecodeError, Exception) as e:
-                    logger.warning(f"  JSON 파싱 오류 (시도 {attempt+1}/3): {e}")
+        prompt = self.prompt_generator(segment)
+
+        if escalate_reason and self.cascade_enabled:
+            result, _ = self._escalate(prompt, escalate_reason, stats)
+        else:
+            # In cascade mode a malformed response goes straight to the stronger model
+            result, failure = self._call_with_retries(prompt, self.llm_caller, PRIMARY_TIER, stats,
+                                                      stop_on_parse_failure=self.cascade_enabled)
+            if result is None and self.cascade_enabled:
+                result, _ = self._escalate(prompt, failure, stats)
+
+        if result is None:
+            logger.warning("  모든 시도 실패, 빈 결과 반환")
+            return {"transition_points": [], "tier": ESCALATION_TIER if self.cascade_enabled else PRIMARY_TIER,
+                    "failed": True}
+
+        if self.dedup_index is not None:
+            self.dedup_index.add(segment, result, sig)
+
+        return result
+
+    def _escalate(self,
+                  prompt: str,
+                  reason: str,
+                  stats: Optional[Dict[str, Any]]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Re-run the prompt on the escalation tier (see _call_with_retries for the return value)."""
+        self._record(stats, "escalation_reasons", reason)
+        logger.info(f"  ↑ 상위 모델로 재분석 (사유: {reason})")
+
+        return self._call_with_retries(prompt, self.escalation_llm_caller, ESCALATION_TIER, stats)
+
+    def _call_with_retries(self,
+                           prompt: str,
+                           llm_caller: Callable[[str], str],
+                           tier: str,
+                           stats: Optional[Dict[str, Any]],
+                           stop_on_parse_failure: bool = False) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Call the LLM up to 3 times.
+
+        Args:
+            stop_on_parse_failure: Give up after the first unparseable response instead of
+                                   retrying (API/transport errors are still retried).
 
+        Returns:
+            Tuple of (result, None) on success, or (None, failure reason) if every attempt
+            failed: "parse_failure" (unparseable response) or "llm_error" (API/transport error).
+        """
+        failure = None
+        for attempt in range(3):
+            if attempt:
+                time.sleep(1)
+
+            try:
+                self._record(stats, "call_counts", tier)
+                raw_response = llm_caller(prompt)
             except Exception as e:
                 logger.error(f"  LLM 오류 (시도 {attempt+1}/3): {e}")
+                failure = "llm_error"
+                continue
+
+            try:
+                cleaned_json = sanitize_json_output(raw_response)
+                if HAS_JSON_REPAIR:
+                    data = json_repair.loads(cleaned_json)
+                else:
+                    data = json.loads(cleaned_json)
+                result = _extract_transition_points(data)
+            except Exception as e:
+                logger.warning(f"  JSON 파싱 오류 (시도 {attempt+1}/3): {e}")
+                failure = "parse_failure"
+                if stop_on_parse_failure:
+                    break
+                continue
+
+            result["tier"] = tier
+            tp_count = len(result['transition_points'])
+            logger.info(f"  → LLM 응답: {tp_count}개 전환점 발견")
+
+            for i, tp in enumerate(result['transition_points']):
+                logger.debug(f"    [{i+1}] sig={tp.get('significance', '?')} | '{tp.get('start_text', '')[:25]}...'")
 
-            time.sleep(1)
+            return result, None
 
-        logger.warning("  모든 시도 실패, 빈 결과 반환")
-        return {"transition_points": []}
+        return None, failure
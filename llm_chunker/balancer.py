@@ -0,0 +1,201 @@
+"""
+Load balancing of LLM calls across several OpenAI-compatible endpoints.
+
+Each call is routed to a healthy endpoint chosen by the configured strategy.
+Failed calls (errors or timeouts) fail over to the remaining endpoints, and
+an endpoint that keeps failing is taken out of rotation for a cooldown period.
+"""
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# ── Logger Setup ──
+logger = logging.getLogger("llm_chunker")
+
+STRATEGY_LEAST_OUTSTANDING = "least_outstanding"
+STRATEGY_LATENCY = "latency"
+
+DEFAULT_TIMEOUT = 60.0  # Seconds per request
+DEFAULT_MAX_FAILURES = 3  # Consecutive failures before an endpoint is marked unhealthy
+DEFAULT_COOLDOWN_SECONDS = 30.0  # How long an unhealthy endpoint stays out of rotation
+LATENCY_EWMA_ALPHA = 0.2  # Smoothing factor of the latency moving average
+
+
+class _Endpoint:
+    """Per-endpoint caller and health/latency bookkeeping."""
+    def __init__(self, base_url: str, caller: Callable[[str], str]):
+        self.base_url = base_url
+        self.caller = caller
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.unhealthy_until = 0.0
+        self.total_latency = 0.0
+        self.ewma_latency: Optional[float] = None
+
+    def is_healthy(self, now: float) -> bool:
+        return now >= self.unhealthy_until
+
+
+class LoadBalancedCaller:
+    def __init__(self,
+                 base_urls: List[str],
+                 model: str = "gpt-5-nano",
+                 strategy: str = STRATEGY_LEAST_OUTSTANDING,
+                 api_key: Optional[str] = None,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 max_failures: int = DEFAULT_MAX_FAILURES,
+                 cooldown_seconds: float = DEFAULT_COOLDOWN_SECONDS,
+                 caller_factory: Optional[Callable[[str], Callable[[str], str]]] = None):
+        """
+        LLM caller that spreads requests over several OpenAI-compatible endpoints.
+
+        Args:
+            base_urls: Endpoint base URLs (e.g., ["http://gpu1:8000/v1", "http://gpu2:8000/v1"]).
+            model: Model name served by the endpoints.
+            strategy: "least_outstanding" (fewest in-flight requests) or
+                      "latency" (lowest moving-average latency x in-flight load).
+                      Both penalize endpoints with recent consecutive failures.
+            api_key: API key for the endpoints. If None, uses env var OPENAI_API_KEY.
+            timeout: Request timeout in seconds; a timeout counts as a failure.
+            max_failures: Consecutive failures before an endpoint is taken out of rotation.
+            cooldown_seconds: How long an unhealthy endpoint is skipped.
+            caller_factory: Builds the caller for a base URL. Defaults to
+                            create_openai_caller without client-level retries.
+
+        Examples:
+            >>> caller = LoadBalancedCaller(
+            ...     ["http://gpu1:8000/v1", "http://gpu2:8000/v1"],
+            ...     model="Qwen/Qwen2.5-7B-Instruct",
+            ...     strategy="latency"
+            ... )
+            >>> response = caller(prompt)
+            >>> caller.get_stats()
+
+            # Usually configured through TransitionAnalyzer
+            >>> analyzer = TransitionAnalyzer(
+            ...     model="Qwen/Qwen2.5-7B-Instruct",
+            ...     base_urls=["http://gpu1:8000/v1", "http://gpu2:8000/v1"]
+            ... )
+        """
+        if not base_urls:
+            raise ValueError("At least one base URL is required.")
+        if strategy not in (STRATEGY_LEAST_OUTSTANDING, STRATEGY_LATENCY):
+            raise ValueError(f"Unknown strategy: {strategy}")
+
+        if caller_factory is None:
+            def caller_factory(base_url: str) -> Callable[[str], str]:
+                from llm_chunker.analyzer import create_openai_caller
+                # Failover replaces client-level retries
+                return create_openai_caller(model=model, base_url=base_url, api_key=api_key,
+                                            timeout=timeout, max_retries=0)
+
+        self.model = model
+        self.strategy = strategy
+        self.max_failures = max_failures
+        self.cooldown_seconds = cooldown_seconds
+        self._endpoints = [_Endpoint(url, caller_factory(url)) for url in base_urls]
+        self._lock = threading.Lock()
+        self._rr = 0  # Round-robin offset for tie-breaking
+
+    def _score(self, ep: _Endpoint, fallback_latency: float) -> float:
+        """Lower is better. Recent consecutive failures make an endpoint less attractive."""
+        if self.strategy == STRATEGY_LATENCY:
+            # Endpoints without a successful request are scored like the slowest known one
+            latency = ep.ewma_latency if ep.ewma_latency is not None else fallback_latency
+            return latency * (ep.outstanding + 1) * (ep.consecutive_failures + 1)
+        return ep.outstanding + ep.consecutive_failures
+
+    def _acquire(self, exclude: List[_Endpoint]) -> Optional[_Endpoint]:
+        """Pick an endpoint and count the request as in-flight."""
+        with self._lock:
+            now = time.time()
+            candidates = [ep for ep in self._endpoints if ep not in exclude]
+            if not candidates:
+                return None
+
+            healthy = [ep for ep in candidates if ep.is_healthy(now)]
+            if healthy:
+                n = len(healthy)
+                self._rr = (self._rr + 1) % n
+                rotated = healthy[self._rr:] + healthy[:self._rr]
+                fallback = max((e.ewma_latency for e in self._endpoints if e.ewma_latency is not None), default=1.0)
+                ep = min(rotated, key=lambda e: self._score(e, fallback))
+            else:
+                # Every remaining endpoint is cooling down: try the one recovering first
+                ep = min(candidates, key=lambda e: e.unhealthy_until)
+
+            ep.outstanding += 1
+            ep.requests += 1
+            return ep
+
+    def _release(self, ep: _Endpoint, latency: float, ok: bool) -> None:
+        with self._lock:
+            ep.outstanding -= 1
+            if ok:
+                ep.consecutive_failures = 0
+                ep.unhealthy_until = 0.0
+                ep.total_latency += latency
+                if ep.ewma_latency is None:
+                    ep.ewma_latency = latency
+                else:
+                    ep.ewma_latency = LATENCY_EWMA_ALPHA * latency + (1 - LATENCY_EWMA_ALPHA) * ep.ewma_latency
+            else:
+                ep.failures += 1
+                ep.consecutive_failures += 1
+                if ep.consecutive_failures >= self.max_failures:
+                    now = time.time()
+                    was_healthy = ep.is_healthy(now)
+                    ep.unhealthy_until = now + self.cooldown_seconds
+                    if was_healthy:
+                        logger.warning(f"  엔드포인트 비활성화 ({self.cooldown_seconds:.0f}초): {ep.base_url}")
+
+    def __call__(self, prompt: str) -> str:
+        tried: List[_Endpoint] = []
+        last_error: Optional[Exception] = None
+
+        while True:
+            ep = self._acquire(tried)
+            if ep is None:
+                break
+            tried.append(ep)
+
+            start = time.perf_counter()
+            try:
+                response = ep.caller(prompt)
+            except Exception as e:
+                self._release(ep, time.perf_counter() - start, ok=False)
+                logger.warning(f"  엔드포인트 오류, 다른 엔드포인트로 전환: {ep.base_url} ({e})")
+                last_error = e
+                continue
+
+            self._release(ep, time.perf_counter() - start, ok=True)
+            return response
+
+        raise RuntimeError(f"All {len(self._endpoints)} endpoints failed: {last_error}")
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return per-endpoint statistics keyed by base URL.
+
+        Returns:
+            Dict of {base_url: {requests, failures, outstanding, healthy,
+            avg_latency, ewma_latency}}. Latencies are in seconds over
+            successful requests (None if there were none).
+        """
+        with self._lock:
+            now = time.time()
+            stats = {}
+            for ep in self._endpoints:
+                successes = ep.requests - ep.failures - ep.outstanding
+                stats[ep.base_url] = {
+                    "requests": ep.requests,
+                    "failures": ep.failures,
+                    "outstanding": ep.outstanding,
+                    "healthy": ep.is_healthy(now),
+                    "avg_latency": ep.total_latency / successes if successes > 0 else None,
+                    "ewma_latency": ep.ewma_latency,
+                }
+            return stats
@@ -0,0 +1,293 @@
+"""
+Command-line entry point: chunk files, directories or JSONL streams.
+
+Examples:
+    $ llm-chunker docs/ --glob "*.md" --model gpt-4o --concurrency 8 > chunks.jsonl
+    $ cat corpus.jsonl | llm-chunker --text-field body --id-field uid > chunks.jsonl
+
+Each output line is a chunk record: {"doc_id": ..., "chunk_index": ..., "text": ...}.
+Progress and the throughput summary are written to stderr.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from tqdm import tqdm
+
+from .analyzer import TransitionAnalyzer
+from .balancer import LoadBalancedCaller
+from .core import (
+    GenericChunker,
+    DEFAULT_SIGNIFICANCE_THRESHOLD,
+    DEFAULT_MIN_CHUNK_GAP,
+    DEFAULT_FUZZY_MATCH_THRESHOLD,
+    DEFAULT_MAX_SEGMENT_SIZE,
+    DEFAULT_OVERLAP_SIZE,
+)
+from .dedup import NearDuplicateIndex, DEFAULT_SIMILARITY_THRESHOLD
+from .normalizer import TextNormalizer
+from .prompts import get_default_prompt, get_legal_prompt
+
+# ── Logger Setup ──
+logger = logging.getLogger("llm_chunker")
+
+PROMPTS = {
+    "default": get_default_prompt,
+    "legal": get_legal_prompt,
+}
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_GLOB = "*.txt"
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="llm-chunker",
+        description="Split documents into semantic chunks with an LLM and write chunk records as JSONL to stdout.",
+    )
+    parser.add_argument("inputs", nargs="*",
+                        help="Files or directories to chunk. '.jsonl' files are read as JSONL. "
+                             "Reads JSONL from stdin if omitted or '-'.")
+    parser.add_argument("--glob", default=DEFAULT_GLOB,
+                        help=f"File pattern used inside directories (default: {DEFAULT_GLOB})")
+    parser.add_argument("--id-field", default="id", help="JSONL field holding the document id (default: id)")
+    parser.add_argument("--text-field", default="text", help="JSONL field holding the document text (default: text)")
+
+    parser.add_argument("--model", default=None, help="OpenAI model name (default: env OPENAI_MODEL or gpt-4o)")
+    parser.add_argument("--escalation-model", default=None, help="Stronger model for cascade mode")
+    parser.add_argument("--base-url", action="append", dest="base_urls", default=None,
+                        help="OpenAI-compatible endpoint; repeat to load-balance over several replicas")
+    parser.add_argument("--balancing-strategy", choices=["least_outstanding", "latency"], default="least_outstanding")
+    parser.add_argument("--near-duplicate-threshold", type=float, default=None,
+                        help="Reuse results of near-duplicate segments (estimated Jaccard, e.g. 0.9)")
+    parser.add_argument("--near-duplicate-index", default=None,
+                        help="JSON file to load/save the near-duplicate index across runs")
+    parser.add_argument("--prompt", choices=sorted(PROMPTS), default="default", help="Built-in prompt (default: default)")
+    parser.add_argument("--significance-threshold", type=int, default=DEFAULT_SIGNIFICANCE_THRESHOLD)
+    parser.add_argument("--min-chunk-gap", type=int, default=DEFAULT_MIN_CHUNK_GAP)
+    parser.add_argument("--fuzzy-match-threshold", type=float, default=DEFAULT_FUZZY_MATCH_THRESHOLD)
+    parser.add_argument("--max-segment-size", type=int, default=DEFAULT_MAX_SEGMENT_SIZE)
+    parser.add_argument("--overlap-size", type=int, default=DEFAULT_OVERLAP_SIZE)
+    parser.add_argument("--context-size", type=int, default=None,
+                        help="Overlap-aware mode: send this many preceding characters as read-only context "
+                             "instead of overlapping segments")
+
+    parser.add_argument("--normalize", action="store_true",
+                        help="Collapse whitespace in prompt payloads (offsets still refer to the original text)")
+    parser.add_argument("--noise-pattern", action="append", dest="noise_patterns", default=None,
+                        help="Regex (multiline) removed from prompt payloads, e.g. page headers; implies --normalize")
+
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Documents processed in parallel (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--verbose", action="store_true", help="Enable detailed logging on stderr")
+    parser.add_argument("--quiet", action="store_true", help="Disable progress bar and summary")
+    return parser
+
+
+# ── Input readers ──
+
+def _iter_jsonl(stream, source: str, id_field: str, text_field: str,
+                errors: List[str]) -> Iterator[Tuple[str, str]]:
+    for line_no, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        ref = f"{source}:{line_no}"
+        try:
+            record = json.loads(line)
+            doc_id = record.get(id_field, ref)
+            text = record[text_field]
+            if not isinstance(text, str):
+                raise TypeError(f"'{text_field}' is not a string")
+        except Exception as e:
+            # A bad record must not abort the documents still in flight
+            errors.append(ref)
+            logger.error(f"[CLI] 잘못된 레코드 건너뜀: {ref} ({type(e).__name__}: {e})")
+            continue
+        yield str(doc_id), text
+
+
+def _read_file(path: str, errors: List[str]) -> Optional[str]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        errors.append(path)
+        logger.error(f"[CLI] 파일 읽기 실패: {path} ({e})")
+        return None
+
+
+def _iter_documents(inputs: List[str], pattern: str, id_field: str, text_field: str,
+                    errors: List[str]) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (doc_id, text) pairs from the given paths or stdin.
+    Unreadable files and invalid JSONL records are logged, appended to 'errors' and skipped.
+    """
+    if not inputs:
+        inputs = ["-"]
+
+    for path in inputs:
+        if path == "-":
+            yield from _iter_jsonl(sys.stdin, "stdin", id_field, text_field, errors)
+        elif os.path.isdir(path):
+            for file_path in sorted(Path(path).rglob(pattern)):
+                if file_path.is_file():
+                    text = _read_file(str(file_path), errors)
+                    if text is not None:
+                        yield str(file_path), text
+        elif path.endswith(".jsonl"):
+            try:
+                f = open(path, encoding="utf-8")
+            except OSError as e:
+                errors.append(path)
+                logger.error(f"[CLI] 파일 읽기 실패: {path} ({e})")
+                continue
+            with f:
+                yield from _iter_jsonl(f, path, id_field, text_field, errors)
+        else:
+            text = _read_file(path, errors)
+            if text is not None:
+                yield path, text
+
+
+def _call_summary(analyzer: TransitionAnalyzer) -> List[str]:
+    """Per-tier call counts and, for load-balanced tiers, per-endpoint statistics."""
+    stats = analyzer.get_stats()
+    line = f"   LLM calls: {stats['call_counts']}"
+    if analyzer.cascade_enabled:
+        line += f" | escalations: {stats['escalation_reasons']}"
+    lines = [line]
+
+    for tier, caller in (("primary", analyzer.llm_caller), ("escalation", analyzer.escalation_llm_caller)):
+        if not isinstance(caller, LoadBalancedCaller):
+            continue
+        for base_url, ep in caller.get_stats().items():
+            avg = f"{ep['avg_latency']:.2f}s" if ep["avg_latency"] is not None else "-"
+            lines.append(
+                f"   [{tier}] {base_url}: {ep['requests']} requests, {ep['failures']} failed, avg latency {avg}"
+                + ("" if ep["healthy"] else " (cooling down)")
+            )
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+
+    if args.verbose:
+        logger.setLevel(logging.DEBUG)
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] %(message)s', datefmt='%H:%M:%S'))
+            logger.addHandler(handler)
+
+    dedup_index = None
+    if args.near_duplicate_threshold is not None or args.near_duplicate_index:
+        dedup_index = NearDuplicateIndex(
+            similarity_threshold=args.near_duplicate_threshold or DEFAULT_SIMILARITY_THRESHOLD,
+            fuzzy_match_threshold=args.fuzzy_match_threshold,
+            path=args.near_duplicate_index,
+        )
+
+    analyzer = TransitionAnalyzer(
+        prompt_generator=PROMPTS[args.prompt],
+        model=args.model,
+        escalation_model=args.escalation_model,
+        base_urls=args.base_urls,
+        balancing_strategy=args.balancing_strategy,
+        dedup_index=dedup_index,
+    )
+
+    normalizer = None
+    if args.normalize or args.noise_patterns:
+        normalizer = TextNormalizer(noise_patterns=args.noise_patterns)
+
+    # One chunker shared by all worker threads
+    chunker = GenericChunker(
+        analyzer=analyzer,
+        significance_threshold=args.significance_threshold,
+        min_chunk_gap=args.min_chunk_gap,
+        fuzzy_match_threshold=args.fuzzy_match_threshold,
+        max_segment_size=args.max_segment_size,
+        overlap_size=args.overlap_size,
+        context_size=args.context_size,
+        normalizer=normalizer,
+        thread_safe=True,
+    )
+
+    def process(doc_id: str, text: str) -> Tuple[str, List[str], int]:
+        return doc_id, chunker.split_text(text), len(text)
+
+    input_errors: List[str] = []
+    documents = _iter_documents(args.inputs, args.glob, args.id_field, args.text_field, input_errors)
+    progress = tqdm(desc="📄 Documents", unit="doc", disable=args.quiet, file=sys.stderr)
+
+    doc_count = chunk_count = char_count = failures = 0
+    start = time.perf_counter()
+    concurrency = max(1, args.concurrency)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = {}
+        exhausted = False
+
+        while pending or not exhausted:
+            # Keep a bounded window of in-flight documents
+            while not exhausted and len(pending) < concurrency * 2:
+                try:
+                    doc_id, text = next(documents)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending[executor.submit(process, doc_id, text)] = doc_id
+
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                doc_id = pending.pop(future)
+                try:
+                    _, chunks, n_chars = future.result()
+                except Exception as e:
+                    failures += 1
+                    logger.error(f"[CLI] 문서 처리 실패: {doc_id} ({e})")
+                    continue
+
+                for i, chunk in enumerate(chunks):
+                    sys.stdout.write(json.dumps({"doc_id": doc_id, "chunk_index": i, "text": chunk}, ensure_ascii=False) + "\n")
+                sys.stdout.flush()
+
+                doc_count += 1
+                chunk_count += len(chunks)
+                char_count += n_chars
+                progress.update(1)
+
+    progress.close()
+    elapsed = time.perf_counter() - start
+    failures += len(input_errors)
+
+    if not args.quiet:
+        print(
+            f"✅ {doc_count} documents → {chunk_count} chunks ({char_count:,} chars) "
+            f"in {elapsed:.1f}s | {doc_count / elapsed if elapsed else 0:.2f} docs/s, "
+            f"{char_count / elapsed if elapsed else 0:,.0f} chars/s"
+            + (f" | {dedup_index.hits} near-duplicate LLM calls skipped" if dedup_index is not None else "")
+            + (f" | {failures} failed" if failures else ""),
+            file=sys.stderr,
+        )
+        for line in _call_summary(analyzer):
+            print(line, file=sys.stderr)
+
+    if dedup_index is not None and dedup_index.path:
+        dedup_index.save()
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
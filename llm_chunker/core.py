@@ -2,8 +2,10 @@ import logging
 from typing import List, Tuple, Dict, Any, Optional
 from tqdm import tqdm
 from .text_utils import split_text_into_processing_segments
-from .analyzer import TransitionAnalyzer
+from .analyzer import TransitionAnalyzer, ESCALATION_TIER, new_stats
 from .fuzzy_match import find_best_match
+from .analysis import ANALYSIS_VERSION
+from .normalizer import TextNormalizer, OffsetMap
 
 # ── Logger Setup ──
 logger = logging.getLogger("llm_chunker")
@@ -14,57 +16,104 @@ DEFAULT_MIN_CHUNK_GAP = 200
 DEFAULT_FUZZY_MATCH_THRESHOLD = 0.8
 DEFAULT_MAX_SEGMENT_SIZE = 5000  # Maximum characters per segment for LLM processing
 DEFAULT_OVERLAP_SIZE = 600  # Characters to overlap between segments
+DEFAULT_ESCALATION_MARGIN = 1  # Significance distance from threshold that counts as borderline (cascade mode)
+
+# Markers around the read-only context in overlap-aware mode (context_size)
+CONTEXT_START_MARKER = "[CONTEXT - already analyzed. Do NOT report transition points in this part.]"
+CONTEXT_END_MARKER = "[END OF CONTEXT - report transition points only in the text below.]"
+CONTEXT_LOOKAHEAD = 100  # Characters after each segment sent along so boundaries near its end are fully visible
 
 
 class GenericChunker:
     def __init__(self,
                  analyzer: Optional[TransitionAnalyzer] = None,
                  model: Optional[str] = None,
+                 escalation_model: Optional[str] = None,
                  significance_threshold: int = DEFAULT_SIGNIFICANCE_THRESHOLD,
                  min_chunk_gap: int = DEFAULT_MIN_CHUNK_GAP,
                  fuzzy_match_threshold: float = DEFAULT_FUZZY_MATCH_THRESHOLD,
                  max_segment_size: int = DEFAULT_MAX_SEGMENT_SIZE,
                  overlap_size: int = DEFAULT_OVERLAP_SIZE,
+                 context_size: Optional[int] = None,
+                 escalation_margin: int = DEFAULT_ESCALATION_MARGIN,
+                 normalizer: Optional[TextNormalizer] = None,
                  verbose: bool = False,
-                 show_progress: bool = False):
+                 show_progress: bool = False,
+                 thread_safe: bool = False):
         """
         Initialize the GenericChunker with configurable parameters.
 
         Args:
             analyzer: Instance of TransitionAnalyzer. If provided, 'model' is ignored.
             model: OpenAI model name (e.g., "gpt-4o"). Shortcut to create default analyzer.
+            escalation_model: Stronger model for cascade mode (e.g., "gpt-4o" with model="gpt-5-nano").
+                              Ignored if 'analyzer' is provided.
             significance_threshold: Minimum significance score (1-10) for a transition point.
             min_chunk_gap: Minimum characters between chunk boundaries.
             fuzzy_match_threshold: Minimum similarity ratio for fuzzy text matching.
             max_segment_size: Maximum characters per segment for LLM processing.
             overlap_size: Characters to overlap between segments to catch boundary transitions.
+            context_size: Enables overlap-aware mode. Segments no longer overlap; instead the
+                          preceding context_size characters are sent as read-only context
+                          and the model reports boundaries only in the new region
+                          ('overlap_size' is then ignored). A short lookahead after each
+                          segment is sent as well; boundaries found there belong to the
+                          next segment.
+            escalation_margin: In cascade mode (analyzer with escalation_model), a segment is
+                               escalated if any point scores within this distance of
+                               significance_threshold (threshold - margin <= sig < threshold + margin).
+            normalizer: TextNormalizer applied to each segment before prompting (collapses
+                        whitespace, strips noise patterns). Matched positions are mapped
+                        back to exact offsets in the original text.
             verbose: If True, enables INFO level logging. If False, only WARNING+.
             show_progress: If True, shows tqdm progress bar during processing.
+            thread_safe: If True, one instance can be shared by many threads. The global
+                         'llm_chunker' logger is left untouched (configure logging in the
+                         application; 'verbose' and 'show_progress' are not allowed),
+                         nothing is printed to stdout, and the configuration is frozen
+                         after initialization.
+                         Per-call state (statistics, transition points) is always kept
+                         per call.
+
+        Examples:
+            # One shared instance for all request threads of a server
+            >>> chunker = GenericChunker(model="gpt-4o", thread_safe=True)
+            >>> with ThreadPoolExecutor(16) as pool:
+            ...     results = list(pool.map(chunker.split_text, documents))
         """
-        # Configure logging based on verbose flag
-        if verbose:
-            logger.setLevel(logging.DEBUG)
-            # Add handler if none exists
-            if not logger.handlers:
-                handler = logging.StreamHandler()
-                handler.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] %(message)s', datefmt='%H:%M:%S'))
-                logger.addHandler(handler)
-        else:
-            logger.setLevel(logging.WARNING)
+        if thread_safe and show_progress:
+            raise ValueError("show_progress prints to stdout and cannot be used with thread_safe=True.")
+        if thread_safe and verbose:
+            raise ValueError("verbose reconfigures the global 'llm_chunker' logger and cannot be used with "
+                             "thread_safe=True. Configure logging in the application instead.")
+
+        # Configure logging based on verbose flag (global logger, so not in thread-safe mode)
+        if not thread_safe:
+            if verbose:
+                logger.setLevel(logging.DEBUG)
+                # Add handler if none exists
+                if not logger.handlers:
+                    handler = logging.StreamHandler()
+                    handler.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] %(message)s', datefmt='%H:%M:%S'))
+                    logger.addHandler(handler)
+            else:
+                logger.setLevel(logging.WARNING)
         
         if analyzer is not None:
             self.analyzer = analyzer
-        elif model is not None:
-            self.analyzer = TransitionAnalyzer(model=model)
         else:
-            self.analyzer = TransitionAnalyzer()
+            self.analyzer = TransitionAnalyzer(model=model, escalation_model=escalation_model)
         
         self.significance_threshold = significance_threshold
         self.min_chunk_gap = min_chunk_gap
         self.fuzzy_match_threshold = fuzzy_match_threshold
         self.max_segment_size = max_segment_size
         self.overlap_size = overlap_size
+        self.context_size = context_size
+        self.escalation_margin = escalation_margin
+        self.normalizer = normalizer
         self.show_progress = show_progress
+        self.thread_safe = thread_safe
 
         logger.info(f"\n{'─'*50}")
         logger.info(f"GenericChunker 초기화")
@@ -72,36 +121,111 @@ class GenericChunker:
         logger.info(f"  min_chunk_gap: {min_chunk_gap}")
         logger.info(f"  max_segment_size: {max_segment_size}")
         logger.info(f"  overlap_size: {overlap_size}")
+        if context_size is not None:
+            logger.info(f"  context_size: {context_size} (오버랩 대신 읽기 전용 컨텍스트)")
         logger.info(f"{'─'*50}")
 
-    def split_text(self, text: str) -> List[str]:
+        # Freeze the configuration so a shared instance cannot change under running calls
+        self._frozen = thread_safe
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if getattr(self, "_frozen", False):
+            raise AttributeError(f"GenericChunker is immutable in thread-safe mode (cannot set '{name}')")
+        super().__setattr__(name, value)
+
+    def split_text(self, text: str, return_analysis: bool = False):
         """
         Splits the text into chunks based on the configured transition logic.
-        
+
+        Args:
+            text: The text to split.
+            return_analysis: If True, also return the raw analysis artifact, which
+                             rechunk() can re-filter with other thresholds without
+                             calling the LLM again.
+
         Returns:
             List[str]: A list of text chunks.
+            If return_analysis is True, a tuple of (chunks, analysis).
         """
         if not text:
             logger.warning("[Chunker] Empty text provided")
-            return []
+            return ([], self._build_analysis(text, [])) if return_analysis else []
         
         logger.info(f"\n{'═'*50}")
         logger.info(f"텍스트 처리 시작 ({len(text):,} 글자)")
         logger.info(f"{'═'*50}")
             
-        # 1. Find all transition points
-        all_points = self._find_transition_points(text)
-        
-        # 2. Handle no transition points case
-        if not all_points:
+        # 1. Analyze all segments with the LLM
+        analysis = self.analyze(text)
+
+        # 2. Filter transition points
+        points = self._filter_points(
+            analysis,
+            significance_threshold=self.significance_threshold,
+            min_chunk_gap=self.min_chunk_gap,
+            fuzzy_match_threshold=self.fuzzy_match_threshold,
+        )
+
+        if self.show_progress:
+            print(f"✅ Found {len(points)} transition points")
+
+        # 3. Slice the text based on these points
+        chunks = self._slice_text(text, points)
+
+        # Print chunk summary if show_progress is enabled
+        if self.show_progress:
+            self._print_chunks(chunks)
+
+        return (chunks, analysis) if return_analysis else chunks
+
+    def rechunk(self,
+                analysis: Dict[str, Any],
+                significance_threshold: Optional[int] = None,
+                min_chunk_gap: Optional[int] = None,
+                fuzzy_match_threshold: Optional[float] = None) -> List[str]:
+        """
+        Re-apply the filtering pipeline to a raw analysis artifact (no LLM calls).
+
+        Args:
+            analysis: Artifact from analyze(), split_text(..., return_analysis=True)
+                      or load_analysis().
+            significance_threshold: Overrides the instance setting if given.
+            min_chunk_gap: Overrides the instance setting if given.
+            fuzzy_match_threshold: Overrides the instance setting if given. Snippets are
+                                   re-matched against the text only if it differs from
+                                   the threshold the analysis was matched with.
+
+        Returns:
+            List[str]: A list of text chunks.
+
+        Example:
+            >>> chunks, analysis = chunker.split_text(text, return_analysis=True)
+            >>> for threshold in range(5, 10):
+            ...     print(threshold, len(chunker.rechunk(analysis, significance_threshold=threshold)))
+        """
+        text = analysis["text"]
+        if not text:
+            return []
+
+        points = self._filter_points(
+            analysis,
+            significance_threshold=self.significance_threshold if significance_threshold is None else significance_threshold,
+            min_chunk_gap=self.min_chunk_gap if min_chunk_gap is None else min_chunk_gap,
+            fuzzy_match_threshold=self.fuzzy_match_threshold if fuzzy_match_threshold is None else fuzzy_match_threshold,
+        )
+        return self._slice_text(text, points)
+
+    def _slice_text(self, text: str, points: List[Dict[str, Any]]) -> List[str]:
+        """Slice the text at the filtered transition points."""
+        # Handle no transition points case
+        if not points:
             logger.warning("[Chunker] 전환점을 찾지 못했습니다")
             return [text]
-        
-        # 3. Slice the text based on these points
+
         chunks = []
         last_pos = 0
         
-        for i, p in enumerate(all_points):
+        for p in points:
             pos = p["position_in_full_text"]
             if pos > last_pos:
                 chunk = text[last_pos:pos].strip()
@@ -121,10 +245,6 @@ class GenericChunker:
         for i, c in enumerate(chunks):
             logger.info(f"  청크 {i+1}: {len(c):,} 글자")
 
-        # Print chunk summary if show_progress is enabled
-        if self.show_progress:
-            self._print_chunks(chunks)
-
         return chunks
 
     def _print_chunks(self, chunks: List[str]) -> None:
@@ -150,52 +270,296 @@ class GenericChunker:
         print(f"- 최소 길이: {min(chunk_lengths)} 글자")
         print(f"- 최대 길이: {max(chunk_lengths)} 글자")
 
-    def _find_transition_points(self, text: str) -> List[Dict[str, Any]]:
+    @property
+    def _segment_overlap(self) -> int:
+        """Overlap between analyzed segments (none in overlap-aware mode)."""
+        return 0 if self.context_size is not None else self.overlap_size
+
+    def _context_before(self, text: str, seg_start: int) -> str:
+        """Read-only context preceding a segment (overlap-aware mode only)."""
+        if self.context_size is None or seg_start == 0:
+            return ""
+
+        context = text[max(0, seg_start - self.context_size):seg_start]
+        if self.normalizer is not None:
+            context = self.normalizer.normalize(context)[0]
+        return context.strip()
+
+    def _window(self, text: str, seg: str, seg_start: int) -> str:
+        """Segment plus its lookahead (overlap-aware mode only)."""
+        if self.context_size is None:
+            return seg
+        seg_end = seg_start + len(seg)
+        return seg + text[seg_end:seg_end + CONTEXT_LOOKAHEAD]
+
+    def _drop_lookahead_points(self,
+                               transition_points: List[Dict[str, Any]],
+                               positions: List[Optional[int]],
+                               seg_end: int) -> Tuple[List[Dict[str, Any]], List[Optional[int]]]:
+        """Drop points that start in the lookahead; the next segment reports them."""
+        kept = [(p, pos) for p, pos in zip(transition_points, positions) if pos is None or pos < seg_end]
+        if len(kept) < len(transition_points):
+            logger.debug(f"  → 다음 세그먼트 영역 전환점 제외: {len(transition_points) - len(kept)}개")
+        return [p for p, _ in kept], [pos for _, pos in kept]
+
+    def _with_context(self, context: str, payload: str) -> str:
+        """Prepend the read-only context, clearly marked, to the segment payload."""
+        if not context:
+            return payload
+        return f"{CONTEXT_START_MARKER}\n{context}\n{CONTEXT_END_MARKER}\n\n{payload}"
+
+    def _reject_context_points(self,
+                               transition_points: List[Dict[str, Any]],
+                               context: str,
+                               payload: str) -> Tuple[List[Dict[str, Any]], int]:
         """
-        Internal method to detect turning points with improved filtering.
+        Drop points quoted from the read-only context before fuzzy matching,
+        so they cannot be fuzzily matched somewhere in the new region.
+
+        Returns:
+            Tuple of (kept points, number of rejected points).
         """
-        points = []
+        if not context:
+            return transition_points, 0
+
+        kept = []
+        for p in transition_points:
+            snippet = p.get("start_text", "")[:50]
+            if snippet and snippet not in payload and \
+                    find_best_match(context, snippet, self.fuzzy_match_threshold) != -1:
+                logger.debug(f"  ✗ 컨텍스트 영역 전환점 제외: '{snippet[:25]}...'")
+                continue
+            kept.append(p)
+        return kept, len(transition_points) - len(kept)
+
+    def _normalize(self, seg: str) -> Tuple[str, Optional[OffsetMap]]:
+        """Apply the normalizer (if any) to a segment's prompt payload."""
+        if self.normalizer is None:
+            return seg, None
+
+        payload, offset_map = self.normalizer.normalize(seg)
+        logger.info(f"  정규화: {len(seg):,} → {len(payload):,} 글자")
+        return payload, offset_map
+
+    def _match_positions(self,
+                         seg: str,
+                         seg_start: int,
+                         transition_points: List[Dict[str, Any]],
+                         fuzzy_match_threshold: float,
+                         offset_map: Optional[OffsetMap] = None) -> Tuple[List[Optional[int]], int]:
+        """
+        Map the LLM's transition points of a segment to absolute positions.
+        If the segment was normalized, 'seg' is the normalized payload and
+        'offset_map' converts its positions back to the original segment.
+
+        Returns:
+            Tuple of (absolute position or None per point, number of unmatched snippets).
+        """
+        positions: List[Optional[int]] = []
+        unmatched = 0
+
+        for p in transition_points:
+            snippet = p.get("start_text", "")[:50]
+            if not snippet:
+                positions.append(None)
+                continue
+
+            # Use fuzzy matching to handle LLM hallucination
+            rel_pos = find_best_match(seg, snippet, fuzzy_match_threshold)
+            if rel_pos == -1:
+                logger.debug(f"  ⚠ 텍스트 못찾음: '{snippet[:25]}...'")
+                positions.append(None)
+                unmatched += 1
+                continue
+
+            if offset_map is not None:
+                rel_pos = offset_map.to_original(rel_pos)
+            positions.append(seg_start + rel_pos)
+
+        return positions, unmatched
+
+    def _escalation_reason(self,
+                           matched: List[Tuple[Dict[str, Any], int]],
+                           unmatched: int,
+                           seg_start: int,
+                           prev_positions: List[int],
+                           prev_end: int,
+                           duplicate_threshold: int) -> Optional[str]:
+        """
+        Decide whether a primary-tier result should be escalated (cascade mode).
+
+        Returns:
+            The escalation reason, or None if the result is trusted.
+        """
+        if unmatched:
+            return "unmatched_snippet"
+
+        low = self.significance_threshold - self.escalation_margin
+        high = self.significance_threshold + self.escalation_margin
+        if any(low <= p.get("significance", 0) < high for p, _ in matched):
+            return "near_threshold"
+
+        # Overlap disagreement: significant points inside the shared region must agree
+        if prev_end > seg_start:
+            prev_in = [pos for pos in prev_positions if pos >= seg_start]
+            cur_in = [pos for p, pos in matched
+                      if pos < prev_end and p.get("significance", 0) >= self.significance_threshold]
+            for a, b in ((prev_in, cur_in), (cur_in, prev_in)):
+                if any(all(abs(x - y) >= duplicate_threshold for y in b) for x in a):
+                    return "overlap_disagreement"
+
+        return None
+
+    def _build_analysis(self,
+                        text: str,
+                        segments: List[Dict[str, Any]],
+                        stats: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Assemble the JSON-serializable raw analysis artifact."""
+        return {
+            "version": ANALYSIS_VERSION,
+            "text": text,
+            "overlap_size": self._segment_overlap,
+            "fuzzy_match_threshold": self.fuzzy_match_threshold,
+            "normalization": self.normalizer.get_config() if self.normalizer is not None else None,
+            "segments": segments,
+            "stats": stats or new_stats(),
+        }
+
+    def analyze(self, text: str, analyzer: Optional[TransitionAnalyzer] = None) -> Dict[str, Any]:
+        """
+        Run the LLM pass over all segments and return the raw analysis artifact.
+
+        The artifact is a JSON-serializable dict holding the text, the segment
+        offsets, the raw 'transition_points' of every segment and their matched
+        absolute positions (None if unmatched), plus the call statistics of this
+        run under 'stats'. Pass it to rechunk() to apply the filtering pipeline.
+
+        Args:
+            text: The text to analyze.
+            analyzer: Analyzer for this call only (defaults to self.analyzer).
+        """
+        analyzer = analyzer or self.analyzer
+        segment_records = []
         seg_idx = 0
-        
+        duplicate_threshold = max(100, self._segment_overlap // 2)
+        stats = new_stats()
+        context_rejections = 0
+
         # Get all segments first for progress bar
         segments = list(split_text_into_processing_segments(
             text,
             max_segment_size=self.max_segment_size,
-            overlap_size=self.overlap_size
+            overlap_size=self._segment_overlap
         ))
         
         # Iterate over segments with optional progress bar
         segment_iter = tqdm(segments, desc="🔍 Analyzing segments", disable=not self.show_progress)
-        
+
+        # Significant positions of the previous segment (for overlap disagreement check)
+        prev_positions: List[int] = []
+        prev_end = 0
+
         for seg, seg_start in segment_iter:
             seg_idx += 1
             logger.info(f"\n[세그먼트 {seg_idx}/{len(segments)}] {len(seg):,} 글자 (시작: {seg_start:,})")
             
+            # Normalize the prompt payload (offsets are mapped back after matching)
+            seg_end = seg_start + len(seg)
+            window = self._window(text, seg, seg_start)
+            payload, offset_map = self._normalize(window)
+            context = self._context_before(text, seg_start)
+            prompt_payload = self._with_context(context, payload)
+
             # Analyze segment with LLM
-            analysis = self.analyzer.analyze_segment(seg)
-            
-            # Map relative positions to absolute positions
-            for p in analysis.get("transition_points", []):
-                snippet = p.get("start_text", "")[:50]
-                if not snippet:
-                    continue
+            result = analyzer.analyze_segment(prompt_payload, stats=stats)
+            tps, rejected = self._reject_context_points(result.get("transition_points", []), context, payload)
+            context_rejections += rejected
+            positions, unmatched = self._match_positions(payload, seg_start, tps, self.fuzzy_match_threshold,
+                                                         offset_map)
+            tps, positions = self._drop_lookahead_points(tps, positions, seg_end)
 
-                # Use fuzzy matching to handle LLM hallucination
-                rel_pos = find_best_match(seg, snippet, self.fuzzy_match_threshold)
-                if rel_pos == -1:
-                    logger.debug(f"  ⚠ 텍스트 못찾음: '{snippet[:25]}...'")
-                    continue
+            # Cascade: re-analyze low-confidence segments with the stronger model
+            if analyzer.cascade_enabled and result.get("tier") != ESCALATION_TIER:
+                matched = [(p, pos) for p, pos in zip(tps, positions) if pos is not None]
+                reason = self._escalation_reason(matched, unmatched, seg_start, prev_positions, prev_end,
+                                                 duplicate_threshold)
+                if reason:
+                    escalated = analyzer.analyze_segment(prompt_payload, escalate_reason=reason, stats=stats)
+                    if escalated.get("failed"):
+                        # Escalation tier unavailable: the primary answer is still usable
+                        logger.warning(f"  상위 모델 분석 실패, 기본 모델 결과 유지 (사유: {reason})")
+                    else:
+                        result = escalated
+                        tps, rejected = self._reject_context_points(result.get("transition_points", []),
+                                                                    context, payload)
+                        context_rejections += rejected
+                        positions, unmatched = self._match_positions(payload, seg_start, tps,
+                                                                     self.fuzzy_match_threshold, offset_map)
+                        tps, positions = self._drop_lookahead_points(tps, positions, seg_end)
+
+            prev_positions = [pos for p, pos in zip(tps, positions)
+                              if pos is not None and p.get("significance", 0) >= self.significance_threshold]
+            prev_end = seg_end
+
+            segment_records.append({
+                "start": seg_start,
+                "end": seg_end,
+                "window_end": seg_start + len(window),
+                "tier": result.get("tier"),
+                "transition_points": tps,
+                "positions": positions,
+            })
+
+        if self.context_size is not None:
+            logger.info(f"\n컨텍스트 영역 전환점 제외: {context_rejections}개")
 
-                abs_pos = seg_start + rel_pos
+        if analyzer.cascade_enabled or analyzer.dedup_index is not None:
+            logger.info(f"\n모델 호출 횟수: {stats['call_counts']} | 재분석 사유: {stats['escalation_reasons']} "
+                        f"| 유사 세그먼트 재사용: {stats['near_duplicate_hits']}")
+            if self.show_progress:
+                print(f"📊 LLM calls per tier: {stats['call_counts']} (escalations: {stats['escalation_reasons']}, "
+                      f"near-duplicate skips: {stats['near_duplicate_hits']})")
+
+        return self._build_analysis(text, segment_records, stats)
+
+    def _filter_points(self,
+                       analysis: Dict[str, Any],
+                       significance_threshold: int,
+                       min_chunk_gap: int,
+                       fuzzy_match_threshold: float) -> List[Dict[str, Any]]:
+        """
+        Filtering pipeline: deduplicate overlapping detections, then filter
+        by significance and minimum gap.
+        """
+        text = analysis["text"]
+        duplicate_threshold = max(100, analysis["overlap_size"] // 2)
+        rematch = fuzzy_match_threshold != analysis["fuzzy_match_threshold"]
+        normalization = analysis.get("normalization")
+        normalizer = TextNormalizer.from_config(normalization) if normalization else None
+        points = []
+
+        for segment in analysis["segments"]:
+            tps = segment["transition_points"]
+            positions = segment["positions"]
+            if rematch:
+                seg_text = text[segment["start"]:segment.get("window_end", segment["end"])]
+                offset_map = None
+                if normalizer is not None:
+                    seg_text, offset_map = normalizer.normalize(seg_text)
+                positions, _ = self._match_positions(seg_text, segment["start"], tps, fuzzy_match_threshold,
+                                                     offset_map)
+
+            for p, abs_pos in zip(tps, positions):
+                # Points in the lookahead (rematched past the segment end) belong to the next segment
+                if abs_pos is None or abs_pos >= segment["end"]:
+                    continue
 
                 # Duplicate check: skip if similar position already exists
-                duplicate_threshold = max(100, self.overlap_size // 2)
                 if any(abs(existing["position_in_full_text"] - abs_pos) < duplicate_threshold for existing in points):
                     logger.debug(f"  ⚠ 중복 스킵: pos={abs_pos:,}")
                     continue
 
-                p["position_in_full_text"] = abs_pos
-                points.append(p)
+                points.append({**p, "position_in_full_text": abs_pos})
                 logger.debug(f"  ✓ 전환점 추가: pos={abs_pos:,} | sig={p.get('significance', '?')}")
 
         # ── Filtering Pipeline ──
@@ -206,15 +570,15 @@ class GenericChunker:
         points.sort(key=lambda x: x["position_in_full_text"])
 
         # 2. Filter by significance
-        high_sig_points = [p for p in points if p.get("significance", 0) >= self.significance_threshold]
-        filtered_out = [p for p in points if p.get("significance", 0) < self.significance_threshold]
+        high_sig_points = [p for p in points if p.get("significance", 0) >= significance_threshold]
+        filtered_out = [p for p in points if p.get("significance", 0) < significance_threshold]
 
         if filtered_out:
             logger.debug(f"  중요도 미달로 제거:")
             for p in filtered_out:
                 logger.debug(f"    ✗ sig={p.get('significance', 0)}: '{p.get('start_text', '')[:25]}...'")
 
-        logger.info(f"  → 중요도 필터 ({self.significance_threshold}+): {len(high_sig_points)}개")
+        logger.info(f"  → 중요도 필터 ({significance_threshold}+): {len(high_sig_points)}개")
 
         # 3. Filter by minimum gap
         filtered = []
@@ -223,7 +587,7 @@ class GenericChunker:
 
         for p in high_sig_points:
             pos = p["position_in_full_text"]
-            if pos - last_pos >= self.min_chunk_gap:
+            if pos - last_pos >= min_chunk_gap:
                 filtered.append(p)
                 last_pos = pos
             else:
@@ -234,15 +598,12 @@ class GenericChunker:
             for pos, gap in gap_removed:
                 logger.debug(f"    ✗ pos={pos:,} (간격: {gap})")
 
-        logger.info(f"  → 간격 필터 ({self.min_chunk_gap}+): {len(filtered)}개")
+        logger.info(f"  → 간격 필터 ({min_chunk_gap}+): {len(filtered)}개")
         logger.info(f"{'─'*50}")
 
         # Final summary
         logger.info(f"\n최종 전환점 {len(filtered)}개:")
         for i, p in enumerate(filtered):
             logger.info(f"  [{i+1}] pos={p['position_in_full_text']:,} | sig={p.get('significance', '?')} | '{p.get('start_text', '')[:30]}...'")
-        
-        if self.show_progress:
-            print(f"✅ Found {len(filtered)} transition points")
-        
+
         return filtered
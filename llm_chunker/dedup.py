@@ -0,0 +1,197 @@
+"""
+Near-duplicate segment detection using MinHash signatures and LSH banding.
+
+Boilerplate-heavy corpora (standard clauses, disclaimers, headers) contain many
+segments that differ by only a few characters. When a segment closely matches
+one that was already analyzed, its transition points are reused and re-anchored
+in the new segment with find_best_match instead of calling the LLM again.
+
+Note: reused results are only valid for the same prompt and model, so use one
+index (or index file) per analyzer configuration.
+"""
+import json
+import logging
+import os
+import random
+import threading
+import zlib
+from typing import Any, Dict, List, Optional
+
+from llm_chunker.fuzzy_match import find_best_match
+
+# Try to import numpy for vectorized signature computation
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# ── Logger Setup ──
+logger = logging.getLogger("llm_chunker")
+
+DEFAULT_SIMILARITY_THRESHOLD = 0.9  # Minimum estimated Jaccard similarity to reuse a result
+DEFAULT_NUM_PERM = 64  # MinHash signature length
+DEFAULT_BANDS = 16  # LSH bands (num_perm must be divisible by bands)
+DEFAULT_SHINGLE_SIZE = 5  # Character n-gram size
+
+# Mersenne prime 2^31-1: a * h + b stays below 2^64 for 32-bit shingle hashes,
+# so the numpy and pure-Python paths produce identical signatures.
+_MERSENNE_PRIME = (1 << 31) - 1
+_SEED = 1  # Fixed seed so signatures stay comparable across processes and runs
+
+
+class NearDuplicateIndex:
+    def __init__(self,
+                 similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+                 num_perm: int = DEFAULT_NUM_PERM,
+                 bands: int = DEFAULT_BANDS,
+                 shingle_size: int = DEFAULT_SHINGLE_SIZE,
+                 fuzzy_match_threshold: float = 0.8,
+                 path: Optional[str] = None):
+        """
+        Initialize a near-duplicate index over analyzed segments.
+
+        Args:
+            similarity_threshold: Minimum estimated Jaccard similarity (0.0 ~ 1.0)
+                                  of character shingles to reuse a previous result.
+            num_perm: Number of MinHash permutations.
+            bands: Number of LSH bands used to find candidates.
+            shingle_size: Character n-gram size (whitespace-collapsed, lowercased).
+            fuzzy_match_threshold: Similarity used to re-anchor reused snippets.
+            path: Optional JSON file. Loaded if it exists; save() writes to it.
+
+        Examples:
+            >>> index = NearDuplicateIndex(similarity_threshold=0.9, path="legal.dedup.json")
+            >>> analyzer = TransitionAnalyzer(prompt_generator=get_legal_prompt, dedup_index=index)
+            >>> chunker = GenericChunker(analyzer=analyzer)
+            >>> chunks = chunker.split_text(text)
+            >>> index.save()
+        """
+        if num_perm % bands != 0:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+
+        self.similarity_threshold = similarity_threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.fuzzy_match_threshold = fuzzy_match_threshold
+        self.path = path
+
+        rng = random.Random(_SEED)
+        self._perms = [(rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+                       for _ in range(num_perm)]
+
+        self._entries: List[Dict[str, Any]] = []
+        self._buckets: List[Dict[tuple, List[int]]] = [{} for _ in range(bands)]
+        self._lock = threading.Lock()
+        self.hits = 0  # Lookups answered from the index (LLM calls skipped)
+
+        if path and os.path.exists(path):
+            self._load(path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def signature(self, segment: str) -> List[int]:
+        """Compute the MinHash signature of a segment."""
+        norm = " ".join(segment.split()).lower()
+        k = self.shingle_size
+        shingles = {zlib.crc32(norm[i:i + k].encode("utf-8")) for i in range(max(1, len(norm) - k + 1))}
+
+        if HAS_NUMPY:
+            h = np.fromiter(shingles, dtype=np.uint64, count=len(shingles))
+            a = np.array([p[0] for p in self._perms], dtype=np.uint64)[:, None]
+            b = np.array([p[1] for p in self._perms], dtype=np.uint64)[:, None]
+            return ((a * h + b) % _MERSENNE_PRIME).min(axis=1).tolist()
+
+        return [min((a * h + b) % _MERSENNE_PRIME for h in shingles) for a, b in self._perms]
+
+    def _band_keys(self, sig: List[int]) -> List[tuple]:
+        return [tuple(sig[i * self.rows:(i + 1) * self.rows]) for i in range(self.bands)]
+
+    def lookup(self, segment: str, sig: Optional[List[int]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Find a previously analyzed near-duplicate and re-anchor its points.
+
+        Args:
+            segment: The new segment.
+            sig: Precomputed signature (optional).
+
+        Returns:
+            Analysis dict with re-anchored 'transition_points', the original
+            'tier' and 'similarity', or None if no near-duplicate exists.
+        """
+        sig = sig or self.signature(segment)
+
+        with self._lock:
+            candidates = set()
+            for band, key in enumerate(self._band_keys(sig)):
+                candidates.update(self._buckets[band].get(key, ()))
+
+            best, best_sim = None, 0.0
+            for idx in candidates:
+                other = self._entries[idx]["signature"]
+                sim = sum(1 for x, y in zip(sig, other) if x == y) / self.num_perm
+                if sim >= best_sim:  # Later entries (e.g. escalated results) win ties
+                    best, best_sim = self._entries[idx], sim
+
+            if best is None or best_sim < self.similarity_threshold:
+                return None
+            self.hits += 1
+
+        # Re-anchor snippets so they are exact quotes of the new segment
+        points = []
+        for p in best["transition_points"]:
+            snippet = p.get("start_text", "")
+            rel_pos = find_best_match(segment, snippet[:50], self.fuzzy_match_threshold)
+            if rel_pos == -1:
+                continue
+            points.append({**p, "start_text": segment[rel_pos:rel_pos + len(snippet)]})
+
+        return {"transition_points": points, "tier": best["tier"], "similarity": best_sim}
+
+    def add(self, segment: str, analysis: Dict[str, Any], sig: Optional[List[int]] = None) -> None:
+        """Index the analysis of a segment."""
+        sig = sig or self.signature(segment)
+        entry = {
+            "signature": sig,
+            "transition_points": [dict(p) for p in analysis.get("transition_points", [])],
+            "tier": analysis.get("tier"),
+        }
+        with self._lock:
+            self._insert(entry)
+
+    def _insert(self, entry: Dict[str, Any]) -> None:
+        idx = len(self._entries)
+        self._entries.append(entry)
+        for band, key in enumerate(self._band_keys(entry["signature"])):
+            self._buckets[band].setdefault(key, []).append(idx)
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Write the index to a JSON file (defaults to the path given at init)."""
+        path = path or self.path
+        if not path:
+            raise ValueError("No path given for saving the index.")
+
+        with self._lock:
+            data = {
+                "num_perm": self.num_perm,
+                "shingle_size": self.shingle_size,
+                "entries": self._entries,
+            }
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+
+    def _load(self, path: str) -> None:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+
+        if data.get("num_perm") != self.num_perm or data.get("shingle_size") != self.shingle_size:
+            raise ValueError(
+                f"Index file '{path}' was built with num_perm={data.get('num_perm')}, "
+                f"shingle_size={data.get('shingle_size')}"
+            )
+        for entry in data["entries"]:
+            self._insert(entry)
+        logger.info(f"중복 인덱스 로드: {len(self._entries)}개 세그먼트 ({path})")
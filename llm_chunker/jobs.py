@@ -0,0 +1,446 @@
+"""
+Durable job queue for chunking large corpora with GenericChunker.
+
+Work items live in a SQLite database, so a crashed or redeployed run resumes
+where it stopped. Workers (processes, possibly on several nodes sharing the
+database file) claim documents with time-limited leases. Per-segment LLM
+results are checkpointed, so a document interrupted mid-way does not pay for
+its already-analyzed segments again.
+
+Note: the default WAL journal keeps its index in shared memory, so it only
+works when every worker runs on the same host. When workers on several nodes
+share the database over a network filesystem, open the queue with
+journal_mode="DELETE" (the filesystem must support POSIX locks).
+"""
+import hashlib
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+# ── Logger Setup ──
+logger = logging.getLogger("llm_chunker")
+
+DEFAULT_LEASE_SECONDS = 300  # Lease duration; renewed by a heartbeat while a document is processed
+DEFAULT_MAX_ATTEMPTS = 3  # Attempts per document before it is marked failed
+DEFAULT_JOURNAL_MODE = "WAL"  # Fastest; every worker must run on the same host
+JOURNAL_MODES = ("WAL", "DELETE")
+
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc_id        TEXT PRIMARY KEY,
+    text          TEXT NOT NULL,
+    status        TEXT NOT NULL DEFAULT 'pending',
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    lease_owner   TEXT,
+    lease_expires REAL,
+    chunks        TEXT,
+    error         TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_documents_status ON documents(status, lease_expires);
+CREATE INDEX IF NOT EXISTS idx_documents_attempts ON documents(status, attempts);
+CREATE TABLE IF NOT EXISTS segments (
+    doc_id   TEXT NOT NULL,
+    seg_key  TEXT NOT NULL,
+    analysis TEXT NOT NULL,
+    PRIMARY KEY (doc_id, seg_key)
+);
+"""
+
+
+class LeaseLostError(RuntimeError):
+    """Raised when a worker's lease on a document expired and was taken over."""
+
+
+class SegmentAnalysisError(RuntimeError):
+    """Raised when every LLM attempt for a segment failed (the document is retried later)."""
+
+
+class JobQueue:
+    def __init__(self,
+                 db_path: str,
+                 lease_seconds: float = DEFAULT_LEASE_SECONDS,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                 journal_mode: str = DEFAULT_JOURNAL_MODE):
+        """
+        Initialize (or open) a durable job queue.
+
+        Args:
+            db_path: Path of the SQLite database file. Created if missing.
+            lease_seconds: How long a claimed document stays reserved for a worker
+                           without a heartbeat before others may take it over.
+            max_attempts: Attempts per document before it is marked as failed.
+            journal_mode: SQLite journal mode. "WAL" (default) requires all workers on
+                          one host; use "DELETE" (rollback journal) when workers on
+                          several nodes share the file over a network filesystem.
+                          All workers of a queue must use the same mode.
+
+        Examples:
+            >>> queue = JobQueue("corpus.db")
+            >>> queue.add_documents([("doc-1", text1), ("doc-2", text2)])
+            >>> run_worker(queue, GenericChunker(model="gpt-4o"))
+            >>> queue.export_jsonl("chunks.jsonl")
+
+            # Workers on several nodes sharing an NFS-mounted database
+            >>> queue = JobQueue("/mnt/shared/corpus.db", journal_mode="DELETE")
+        """
+        journal_mode = journal_mode.upper()
+        if journal_mode not in JOURNAL_MODES:
+            raise ValueError(f"Unknown journal_mode: {journal_mode} (expected one of {JOURNAL_MODES})")
+
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+        with self._connect() as conn:
+            conn.execute(f"PRAGMA journal_mode={journal_mode}")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a short-lived connection (safe across fork and threads)."""
+        conn = sqlite3.connect(self.db_path, timeout=60, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in a write-locked transaction."""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    # ── Enqueue ──
+
+    def add_documents(self, documents: Iterable[Tuple[str, str]]) -> int:
+        """
+        Enqueue documents. Already known doc_ids are ignored, so re-running
+        the same enqueue step after a crash is safe.
+
+        Args:
+            documents: Iterable of (doc_id, text) pairs.
+
+        Returns:
+            int: Number of newly added documents.
+        """
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO documents (doc_id, text) VALUES (?, ?)",
+                ((str(doc_id), text) for doc_id, text in documents)
+            )
+            return conn.total_changes - before
+
+    # ── Leases ──
+
+    def claim(self, worker_id: str) -> Optional[Tuple[str, str]]:
+        """
+        Claim the next pending document (or one whose lease expired).
+
+        A document whose lease expired on its last attempt (its worker died,
+        e.g. from OOM) is marked failed instead of being claimed again.
+
+        Returns:
+            Tuple of (doc_id, text), or None if nothing is left to claim.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            cur = conn.execute(
+                "UPDATE documents SET status = ?, lease_owner = NULL, lease_expires = NULL, error = ? "
+                "WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+                (STATUS_FAILED, "Lease expired on the last attempt (worker died?)",
+                 STATUS_RUNNING, now, self.max_attempts)
+            )
+            if cur.rowcount:
+                logger.warning(f"리스 만료로 실패 처리된 문서: {cur.rowcount}개 (최대 시도 횟수 초과)")
+
+            row = conn.execute(
+                "SELECT doc_id, text FROM documents WHERE status = ? AND lease_expires < ? "
+                "ORDER BY rowid LIMIT 1",
+                (STATUS_RUNNING, now)
+            ).fetchone()
+            if row is None:
+                # Fewest attempts first, so a worker with a broken endpoint does not
+                # burn all attempts of the document it just released
+                row = conn.execute(
+                    "SELECT doc_id, text FROM documents WHERE status = ? "
+                    "ORDER BY attempts, rowid LIMIT 1",
+                    (STATUS_PENDING,)
+                ).fetchone()
+            if row is None:
+                return None
+
+            conn.execute(
+                "UPDATE documents SET status = ?, lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1 WHERE doc_id = ?",
+                (STATUS_RUNNING, worker_id, now + self.lease_seconds, row[0])
+            )
+            return row[0], row[1]
+
+    def renew_lease(self, doc_id: str, worker_id: str) -> None:
+        """
+        Extend the lease on a claimed document.
+
+        Raises:
+            LeaseLostError: If the lease is no longer held by this worker.
+        """
+        with self._transaction() as conn:
+            cur = conn.execute(
+                "UPDATE documents SET lease_expires = ? "
+                "WHERE doc_id = ? AND lease_owner = ? AND status = ?",
+                (time.time() + self.lease_seconds, doc_id, worker_id, STATUS_RUNNING)
+            )
+            if cur.rowcount == 0:
+                raise LeaseLostError(f"Lease on '{doc_id}' lost by worker '{worker_id}'")
+
+    def complete(self, doc_id: str, worker_id: str, chunks: list) -> bool:
+        """
+        Store the chunks of a document and mark it done.
+
+        Returns:
+            bool: False if the lease was lost (the result is discarded).
+        """
+        with self._transaction() as conn:
+            cur = conn.execute(
+                "UPDATE documents SET status = ?, chunks = ?, lease_owner = NULL, "
+                "lease_expires = NULL, error = NULL "
+                "WHERE doc_id = ? AND lease_owner = ? AND status = ?",
+                (STATUS_DONE, json.dumps(chunks, ensure_ascii=False), doc_id, worker_id, STATUS_RUNNING)
+            )
+            if cur.rowcount:
+                # Segment checkpoints are no longer needed
+                conn.execute("DELETE FROM segments WHERE doc_id = ?", (doc_id,))
+            return cur.rowcount > 0
+
+    def fail(self, doc_id: str, worker_id: str, error: str) -> None:
+        """Release a document after an error; marks it failed after max_attempts."""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE documents SET "
+                "status = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+                "lease_owner = NULL, lease_expires = NULL, error = ? "
+                "WHERE doc_id = ? AND lease_owner = ? AND status = ?",
+                (self.max_attempts, STATUS_FAILED, STATUS_PENDING, error, doc_id, worker_id, STATUS_RUNNING)
+            )
+
+    def retry_failed(self) -> int:
+        """Reset failed documents to pending. Returns the number of reset documents."""
+        with self._transaction() as conn:
+            cur = conn.execute(
+                "UPDATE documents SET status = ?, attempts = 0 WHERE status = ?",
+                (STATUS_PENDING, STATUS_FAILED)
+            )
+            return cur.rowcount
+
+    # ── Segment checkpoints ──
+
+    def load_segment(self, doc_id: str, seg_key: str) -> Optional[Dict[str, Any]]:
+        """Return a checkpointed segment analysis, or None."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT analysis FROM segments WHERE doc_id = ? AND seg_key = ?",
+                (doc_id, seg_key)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_segment(self, doc_id: str, seg_key: str, analysis: Dict[str, Any]) -> None:
+        """Checkpoint a segment analysis."""
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO segments (doc_id, seg_key, analysis) VALUES (?, ?, ?)",
+                (doc_id, seg_key, json.dumps(analysis, ensure_ascii=False))
+            )
+
+    # ── Reporting / Output ──
+
+    def status_counts(self) -> Dict[str, int]:
+        """Return the number of documents per status."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM documents GROUP BY status").fetchall()
+        counts = {STATUS_PENDING: 0, STATUS_RUNNING: 0, STATUS_DONE: 0, STATUS_FAILED: 0}
+        counts.update(dict(rows))
+        return counts
+
+    def iter_results(self) -> Iterator[Tuple[str, list]]:
+        """Yield (doc_id, chunks) for every completed document."""
+        with self._connect() as conn:
+            for doc_id, chunks in conn.execute(
+                "SELECT doc_id, chunks FROM documents WHERE status = ? ORDER BY rowid", (STATUS_DONE,)
+            ):
+                yield doc_id, json.loads(chunks)
+
+    def export_jsonl(self, output_path: str) -> int:
+        """
+        Write one JSON record per chunk of every completed document:
+        {"doc_id": ..., "chunk_index": ..., "text": ...}
+
+        Returns:
+            int: Number of written chunk records.
+        """
+        count = 0
+        with open(output_path, "w", encoding="utf-8") as f:
+            for doc_id, chunks in self.iter_results():
+                for i, chunk in enumerate(chunks):
+                    f.write(json.dumps({"doc_id": doc_id, "chunk_index": i, "text": chunk}, ensure_ascii=False) + "\n")
+                    count += 1
+        return count
+
+
+class _LeaseHeartbeat:
+    """
+    Renews a document lease in the background while it is processed, so a
+    single slow LLM call (client timeouts, retries, escalation) cannot outlive
+    the lease and let another worker take the document over mid-call.
+    """
+    def __init__(self, queue: JobQueue, doc_id: str, worker_id: str):
+        self._queue = queue
+        self._doc_id = doc_id
+        self._worker_id = worker_id
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self.lost: Optional[LeaseLostError] = None
+
+    def _run(self) -> None:
+        interval = self._queue.lease_seconds / 3
+        while not self._stop.wait(interval):
+            try:
+                self._queue.renew_lease(self._doc_id, self._worker_id)
+            except LeaseLostError as e:
+                self.lost = e
+                return
+            except Exception as e:
+                # Transient database error: the next beat retries
+                logger.warning(f"[{self._worker_id}] 리스 갱신 실패: {self._doc_id} ({e})")
+
+    def check(self) -> None:
+        """Raise LeaseLostError if the lease was lost in the background."""
+        if self.lost is not None:
+            raise self.lost
+
+    def __enter__(self) -> "_LeaseHeartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+class _CheckpointingAnalyzer:
+    """
+    Wraps an analyzer so each segment result is checkpointed in the queue
+    and the document lease is renewed before every LLM call. A failed segment
+    raises SegmentAnalysisError, so the document goes through JobQueue.fail().
+    """
+    def __init__(self, analyzer, queue: JobQueue, doc_id: str, worker_id: str):
+        self._analyzer = analyzer
+        self._queue = queue
+        self._doc_id = doc_id
+        self._worker_id = worker_id
+
+    def __getattr__(self, name):
+        return getattr(self._analyzer, name)
+
+    def analyze_segment(self,
+                        segment: str,
+                        escalate_reason: Optional[str] = None,
+                        stats: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        tier = "escalation" if escalate_reason else "primary"
+        seg_key = hashlib.sha1(f"{tier}\0{segment}".encode("utf-8")).hexdigest()
+
+        cached = self._queue.load_segment(self._doc_id, seg_key)
+        if cached is not None:
+            logger.debug(f"  ↺ 체크포인트 재사용: {seg_key[:10]}")
+            return cached
+
+        # Fresh lease for the call; the heartbeat keeps it alive if the call is slow
+        self._queue.renew_lease(self._doc_id, self._worker_id)
+        analysis = self._analyzer.analyze_segment(segment, escalate_reason=escalate_reason, stats=stats)
+        if analysis.get("failed"):
+            # Never checkpoint an empty result of a failed call as if it were an answer.
+            # A failed escalation is returned: the chunker keeps the primary result.
+            if escalate_reason:
+                return analysis
+            raise SegmentAnalysisError(f"LLM analysis failed for a segment of '{self._doc_id}'")
+        self._queue.save_segment(self._doc_id, seg_key, analysis)
+        return analysis
+
+
+def default_worker_id() -> str:
+    """Worker id unique across nodes, processes and threads: '<hostname>-<pid>-<thread id>'."""
+    return f"{socket.gethostname()}-{os.getpid()}-{threading.get_ident()}"
+
+
+def run_worker(queue: JobQueue,
+               chunker,
+               worker_id: Optional[str] = None,
+               max_documents: Optional[int] = None) -> int:
+    """
+    Process documents from the queue until it is empty.
+
+    Start one worker per process (on any node sharing the database). Each
+    process must create its own GenericChunker; within a process, several
+    threads may run workers on one chunker created with thread_safe=True.
+
+    Args:
+        queue: The JobQueue to consume.
+        chunker: GenericChunker used for splitting.
+        worker_id: Unique worker id. Defaults to '<hostname>-<pid>-<thread id>'.
+        max_documents: Stop after this many documents (None = until empty).
+
+    Returns:
+        int: Number of documents completed by this worker.
+
+    Example:
+        >>> from multiprocessing import Process
+        >>> def work():
+        ...     run_worker(JobQueue("corpus.db"), GenericChunker(model="gpt-4o"))
+        >>> procs = [Process(target=work) for _ in range(4)]
+    """
+    worker_id = worker_id or default_worker_id()
+    completed = 0
+
+    while max_documents is None or completed < max_documents:
+        item = queue.claim(worker_id)
+        if item is None:
+            break
+
+        doc_id, text = item
+        logger.info(f"[{worker_id}] 문서 처리 시작: {doc_id}")
+        analyzer = _CheckpointingAnalyzer(chunker.analyzer, queue, doc_id, worker_id)
+        try:
+            with _LeaseHeartbeat(queue, doc_id, worker_id) as heartbeat:
+                chunks = chunker.rechunk(chunker.analyze(text, analyzer=analyzer)) if text else []
+            heartbeat.check()
+        except LeaseLostError as e:
+            logger.warning(f"[{worker_id}] {e}")
+            continue
+        except Exception as e:
+            logger.error(f"[{worker_id}] 문서 처리 실패: {doc_id} ({e})")
+            queue.fail(doc_id, worker_id, str(e))
+            continue
+
+        if queue.complete(doc_id, worker_id, chunks):
+            completed += 1
+            logger.info(f"[{worker_id}] 문서 완료: {doc_id} ({len(chunks)}개 청크)")
+        else:
+            logger.warning(f"[{worker_id}] 리스 만료로 결과 폐기: {doc_id}")
+
+    return completed
@@ -0,0 +1,127 @@
+"""
+Prompt payload normalization with an offset map back to the source text.
+
+PDF-extracted text is full of space runs, hard line wraps and page headers.
+TextNormalizer collapses whitespace and strips configurable noise patterns
+before a segment goes into the prompt, and returns an OffsetMap that converts
+positions in the normalized segment back to exact offsets in the original.
+"""
+import re
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Tuple
+
+_WHITESPACE_RUN = re.compile(r"\s+")
+
+
+class OffsetMap:
+    """
+    Compact mapping from normalized positions to original positions.
+
+    Stores one anchor per point where the offset between both texts changes;
+    between anchors the mapping is a constant shift.
+    """
+    def __init__(self, norm_anchors: List[int], orig_anchors: List[int]):
+        self.norm_anchors = norm_anchors
+        self.orig_anchors = orig_anchors
+
+    def __len__(self) -> int:
+        return len(self.norm_anchors)
+
+    def to_original(self, pos: int) -> int:
+        """Convert a position in the normalized text to the original text."""
+        i = bisect_right(self.norm_anchors, pos) - 1
+        if i < 0:
+            return pos
+        return self.orig_anchors[i] + (pos - self.norm_anchors[i])
+
+
+class TextNormalizer:
+    def __init__(self,
+                 collapse_whitespace: bool = True,
+                 noise_patterns: Optional[List[str]] = None):
+        """
+        Initialize the normalizer.
+
+        Args:
+            collapse_whitespace: Collapse whitespace runs into a single space
+                                 (a paragraph break if the run has 2+ newlines).
+            noise_patterns: Regular expressions (re.MULTILINE) whose matches are removed,
+                            e.g. page headers or page numbers.
+
+        Examples:
+            >>> normalizer = TextNormalizer(noise_patterns=[
+            ...     r"^\\s*- \\d+ -\\s*$",            # page numbers like "- 12 -"
+            ...     r"^ACME Corp\\. Annual Report.*$"  # running page header
+            ... ])
+            >>> chunker = GenericChunker(normalizer=normalizer)
+        """
+        self.collapse_whitespace = collapse_whitespace
+        self.noise_patterns = list(noise_patterns or [])
+        self._compiled = [re.compile(p, re.MULTILINE) for p in self.noise_patterns]
+
+    def get_config(self) -> Dict[str, Any]:
+        """Return a JSON-serializable configuration (see from_config)."""
+        return {"collapse_whitespace": self.collapse_whitespace, "noise_patterns": self.noise_patterns}
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "TextNormalizer":
+        return cls(**config)
+
+    def _removable_spans(self, text: str) -> List[Tuple[int, int]]:
+        """Noise matches and (if enabled) whitespace runs, merged and sorted."""
+        spans = []
+        for pattern in self._compiled:
+            spans.extend(m.span() for m in pattern.finditer(text) if m.end() > m.start())
+        if self.collapse_whitespace:
+            spans.extend(m.span() for m in _WHITESPACE_RUN.finditer(text))
+        spans.sort()
+
+        merged: List[Tuple[int, int]] = []
+        for start, end in spans:
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+    def _separator(self, text: str, start: int, end: int) -> str:
+        """Replacement for a removed span."""
+        if not self.collapse_whitespace or start == 0 or end == len(text):
+            return ""
+        gap = text[start:end]
+        if not gap.strip():
+            return "\n\n" if gap.count("\n") >= 2 else " "
+        # Noise match: keep words on both sides apart
+        return "\n\n" if "\n" in gap else " "
+
+    def normalize(self, text: str) -> Tuple[str, OffsetMap]:
+        """
+        Normalize text for the prompt.
+
+        Returns:
+            Tuple of (normalized_text, offset_map).
+        """
+        out: List[str] = []
+        norm_anchors: List[int] = []
+        orig_anchors: List[int] = []
+        n = 0
+        pos = 0
+
+        def emit(piece: str, orig_pos: int) -> None:
+            nonlocal n
+            if not piece:
+                return
+            # Record an anchor only where the shift between both texts changes
+            if not norm_anchors or orig_pos - n != orig_anchors[-1] - norm_anchors[-1]:
+                norm_anchors.append(n)
+                orig_anchors.append(orig_pos)
+            out.append(piece)
+            n += len(piece)
+
+        for start, end in self._removable_spans(text):
+            emit(text[pos:start], pos)
+            emit(self._separator(text, start, end), start)
+            pos = end
+        emit(text[pos:], pos)
+
+        return "".join(out), OffsetMap(norm_anchors, orig_anchors)
@@ -9,7 +9,7 @@ setup(
     author="Theeojeong",
     author_email="wogusto13@gmail.com",
     url="https://github.com/Theeojeong/llm-chunker",
-    packages=find_packages(),
+    packages=find_packages(exclude=["tests", "tests.*"]),
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
@@ -21,10 +21,16 @@ setup(
         "nltk>=3.6",
         "tqdm>=4.0.0",
     ],
+    entry_points={
+        "console_scripts": [
+            "llm-chunker=llm_chunker.cli:main",
+        ],
+    },
     extras_require={
         "fast": [
             "rapidfuzz>=3.0.0",  # 100x faster fuzzy matching
             "json_repair>=0.25.0",  # Robust JSON parsing
+            "numpy>=1.20.0",  # Vectorized MinHash for near-duplicate detection
         ],
     },
 )
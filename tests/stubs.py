@@ -0,0 +1,117 @@
+"""
+Deterministic stand-ins for the LLM used by the test suite.
+
+Documents are built from "Section N:" headings followed by filler sentences.
+StubLLM plays a well-behaved model: it reports every heading it can see in the
+segment (never in the read-only context) as a transition point.
+"""
+import json
+import os
+import re
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+from llm_chunker import GenericChunker, JobQueue, TransitionAnalyzer, run_worker
+from llm_chunker.core import CONTEXT_END_MARKER
+
+HEADING = re.compile(r"Section \d+:")
+SNIPPET_SIZE = 40  # Characters a heading needs to be visible before the stub reports it
+
+FILLER = [
+    "The committee reviewed the figures in detail.",
+    "Several members asked for additional context on the numbers.",
+    "No objections were raised during the discussion.",
+    "The proposal was noted for the next quarterly meeting.",
+    "Staff will circulate a written summary afterwards.",
+]
+
+
+def raw_prompt(segment: str) -> str:
+    """Prompt generator that sends the bare segment, so the stub sees exactly the payload."""
+    return segment
+
+
+def make_section(number: int, sentences: int = 5) -> str:
+    body = " ".join(FILLER[(number + i) % len(FILLER)] for i in range(sentences))
+    return f"Section {number}: Topic number {number} begins here. {body}"
+
+
+def make_document(first_section: int, sections: int = 4, sentences: int = 5) -> str:
+    return "\n\n".join(make_section(first_section + i, sentences) for i in range(sections))
+
+
+def make_corpus(n_docs: int, sections: int = 4) -> List[Tuple[str, str]]:
+    return [(f"d{i}", make_document(i * 10, sections)) for i in range(n_docs)]
+
+
+class StubLLM:
+    """
+    Reports each fully visible heading as a transition point.
+
+    Args:
+        significance: Significance reported for every heading.
+        delay: Seconds to sleep per call (exercises concurrent callers).
+        fail: If True, every call raises like an unreachable endpoint.
+        exit_after: Terminate the process after this many calls (simulates a crash).
+    """
+    def __init__(self,
+                 significance: int = 9,
+                 delay: float = 0.0,
+                 fail: bool = False,
+                 exit_after: Optional[int] = None):
+        self.significance = significance
+        self.delay = delay
+        self.fail = fail
+        self.exit_after = exit_after
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, prompt: str) -> str:
+        with self._lock:
+            self.calls += 1
+            if self.exit_after is not None and self.calls > self.exit_after:
+                os._exit(1)
+        if self.delay:
+            time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("OpenAI API Call Failed: connection refused")
+
+        # Never report anything from the read-only context
+        if CONTEXT_END_MARKER in prompt:
+            prompt = prompt.split(CONTEXT_END_MARKER, 1)[1]
+
+        points = []
+        for m in HEADING.finditer(prompt):
+            snippet = prompt[m.start():m.start() + SNIPPET_SIZE]
+            if len(snippet) < SNIPPET_SIZE:
+                continue  # Heading cut off at the end of the window: not enough to judge
+            points.append({"start_text": snippet, "significance": self.significance, "explanation": "new section"})
+        return json.dumps({"transition_points": points})
+
+
+def make_chunker(llm_caller: Callable[[str], str],
+                 escalation_llm_caller: Optional[Callable[[str], str]] = None,
+                 **kwargs) -> GenericChunker:
+    """GenericChunker whose analyzer calls the given stubs instead of OpenAI (cascade if escalation is given)."""
+    analyzer = TransitionAnalyzer(prompt_generator=raw_prompt)
+    analyzer.llm_caller = llm_caller
+    analyzer.escalation_llm_caller = escalation_llm_caller
+    kwargs.setdefault("max_segment_size", 500)
+    kwargs.setdefault("overlap_size", 100)
+    return GenericChunker(analyzer=analyzer, **kwargs)
+
+
+def expected_chunks(text: str) -> List[str]:
+    """Chunks of a stub document: one per section."""
+    return [section.strip() for section in text.split("\n\n")]
+
+
+def worker_process(db_path: str,
+                   lease_seconds: float,
+                   fail: bool = False,
+                   exit_after: Optional[int] = None,
+                   journal_mode: str = "WAL") -> None:
+    """Target of a worker process (module-level so it works with the spawn start method)."""
+    queue = JobQueue(db_path, lease_seconds=lease_seconds, journal_mode=journal_mode)
+    run_worker(queue, make_chunker(StubLLM(fail=fail, exit_after=exit_after)))
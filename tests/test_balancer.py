@@ -0,0 +1,134 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from llm_chunker import LoadBalancedCaller
+
+
+class _StubServer:
+    """Local OpenAI-compatible endpoint: replies after 'delay' seconds, or with HTTP 500 if 'fail'."""
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.requests = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers["Content-Length"]))
+                stub.requests += 1
+                time.sleep(stub.delay)
+                if stub.fail:
+                    body, status = b'{"error": {"message": "boom"}}', 500
+                else:
+                    body, status = json.dumps({
+                        "id": "x", "object": "chat.completion", "created": 0, "model": "stub",
+                        "choices": [{"index": 0, "finish_reason": "stop",
+                                     "message": {"role": "assistant", "content": "ok"}}],
+                    }).encode(), 200
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self._server.server_address[1]}/v1"
+        threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def servers():
+    started = []
+
+    def start(**kwargs):
+        server = _StubServer(**kwargs)
+        started.append(server)
+        return server
+
+    yield start
+    for server in started:
+        server.close()
+
+
+def test_least_outstanding_spreads_load(servers):
+    replicas = [servers(delay=0.05) for _ in range(3)]
+    caller = LoadBalancedCaller([r.base_url for r in replicas], model="stub")
+
+    with ThreadPoolExecutor(6) as pool:
+        assert list(pool.map(caller, ["prompt"] * 30)) == ["ok"] * 30
+
+    assert sum(r.requests for r in replicas) == 30
+    assert all(r.requests >= 5 for r in replicas)
+    assert [s["requests"] for s in caller.get_stats().values()] == [r.requests for r in replicas]
+
+
+def test_failover_on_server_error_and_cooldown(servers):
+    good, bad = servers(delay=0.05), servers(fail=True)
+    caller = LoadBalancedCaller([good.base_url, bad.base_url], model="stub",
+                                max_failures=2, cooldown_seconds=0.5)
+
+    # Concurrent load keeps the healthy replica busy, so the failing one gets tried
+    with ThreadPoolExecutor(4) as pool:
+        assert list(pool.map(caller, ["prompt"] * 20)) == ["ok"] * 20
+    stats = caller.get_stats()
+    assert stats[bad.base_url]["failures"] == stats[bad.base_url]["requests"] == bad.requests >= 2
+    assert not stats[bad.base_url]["healthy"]
+
+    # Skipped while cooling down, back in rotation afterwards
+    tried = bad.requests
+    assert caller("prompt") == "ok"
+    assert bad.requests == tried
+    time.sleep(0.6)
+    assert caller.get_stats()[bad.base_url]["healthy"]
+    with ThreadPoolExecutor(4) as pool:
+        assert list(pool.map(caller, ["prompt"] * 8)) == ["ok"] * 8
+    assert bad.requests > tried
+
+
+def test_failover_on_timeout(servers):
+    fast, slow = servers(), servers(delay=2.0)
+    caller = LoadBalancedCaller([slow.base_url, fast.base_url], model="stub", timeout=0.3)
+
+    assert [caller("prompt") for _ in range(4)] == ["ok"] * 4
+    assert caller.get_stats()[slow.base_url]["failures"] >= 1
+
+
+def test_latency_strategy_avoids_failing_replica(servers):
+    good, bad = servers(), servers(fail=True)
+    caller = LoadBalancedCaller([good.base_url, bad.base_url], model="stub", strategy="latency")
+
+    assert [caller("prompt") for _ in range(64)] == ["ok"] * 64
+    assert bad.requests <= 1
+
+
+def test_stats_report_latency(servers):
+    good, bad = servers(delay=0.05), servers(fail=True)
+    caller = LoadBalancedCaller([good.base_url, bad.base_url], model="stub")
+
+    for _ in range(6):
+        caller("prompt")
+
+    stats = caller.get_stats()
+    assert stats[good.base_url]["avg_latency"] >= 0.05
+    assert stats[good.base_url]["ewma_latency"] >= 0.05
+    assert stats[good.base_url]["outstanding"] == 0
+    assert stats[bad.base_url]["avg_latency"] is None
+    assert stats[bad.base_url]["ewma_latency"] is None
+
+
+def test_all_endpoints_failing_raises(servers):
+    caller = LoadBalancedCaller([servers(fail=True).base_url, servers(fail=True).base_url], model="stub")
+    with pytest.raises(RuntimeError):
+        caller("prompt")
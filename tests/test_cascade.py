@@ -0,0 +1,52 @@
+import pytest
+
+from llm_chunker import JobQueue, run_worker
+from llm_chunker.jobs import STATUS_DONE
+
+from tests.stubs import StubLLM, expected_chunks, make_chunker, make_document
+
+
+@pytest.fixture(autouse=True)
+def no_retry_sleep(monkeypatch):
+    monkeypatch.setattr("llm_chunker.analyzer.time.sleep", lambda seconds: None)
+
+
+def test_parse_failure_escalates_after_one_call():
+    text = make_document(0)
+    chunker = make_chunker(lambda prompt: "transition_points: none", StubLLM())
+
+    chunks, analysis = chunker.split_text(text, return_analysis=True)
+
+    segments = len(analysis["segments"])
+    assert chunks == expected_chunks(text)
+    assert analysis["stats"]["call_counts"] == {"primary": segments, "escalation": segments}
+    assert analysis["stats"]["escalation_reasons"] == {"parse_failure": segments}
+
+
+def test_llm_errors_have_their_own_reason():
+    chunker = make_chunker(StubLLM(fail=True), StubLLM())
+
+    _, analysis = chunker.split_text(make_document(0), return_analysis=True)
+
+    segments = len(analysis["segments"])
+    assert analysis["stats"]["call_counts"] == {"primary": 3 * segments, "escalation": segments}
+    assert analysis["stats"]["escalation_reasons"] == {"llm_error": segments}
+
+
+def test_escalation_endpoint_down_keeps_primary_result(tmp_path):
+    text = make_document(0)
+    # Borderline significance (threshold 7, margin 1) escalates every segment
+    primary_only = make_chunker(StubLLM(significance=7)).split_text(text)
+    chunker = make_chunker(StubLLM(significance=7), StubLLM(fail=True))
+
+    chunks, analysis = chunker.split_text(text, return_analysis=True)
+
+    assert chunks == primary_only == expected_chunks(text)
+    assert analysis["stats"]["escalation_reasons"] == {"near_threshold": len(analysis["segments"])}
+
+    # The job queue completes the document with the primary result as well
+    queue = JobQueue(str(tmp_path / "corpus.db"))
+    queue.add_documents([("d0", text)])
+    assert run_worker(queue, chunker) == 1
+    assert queue.status_counts()[STATUS_DONE] == 1
+    assert dict(queue.iter_results()) == {"d0": primary_only}
@@ -0,0 +1,52 @@
+import io
+import json
+import re
+import sys
+
+from llm_chunker import LoadBalancedCaller, TransitionAnalyzer, cli
+
+from tests.stubs import StubLLM, expected_chunks, make_document, raw_prompt
+
+
+def _stub_analyzer(**kwargs):
+    analyzer = TransitionAnalyzer(prompt_generator=raw_prompt)
+    analyzer.llm_caller = StubLLM()
+    return analyzer
+
+
+def test_bad_jsonl_records_are_skipped(monkeypatch, capsys):
+    text = make_document(0)
+    lines = [
+        json.dumps({"id": "a", "text": text}),
+        "{not json",
+        json.dumps({"id": "b"}),
+        json.dumps({"id": "c", "text": text}),
+    ]
+    monkeypatch.setattr(cli, "TransitionAnalyzer", _stub_analyzer)
+    monkeypatch.setattr(sys, "stdin", io.StringIO("\n".join(lines) + "\n"))
+
+    assert cli.main(["--quiet", "--max-segment-size", "500", "--overlap-size", "100"]) == 1
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert sorted({r["doc_id"] for r in records}) == ["a", "c"]
+    assert [r["text"] for r in records if r["doc_id"] == "a"] == expected_chunks(text)
+
+
+def test_summary_reports_calls_per_tier_and_endpoint(monkeypatch, capsys):
+    def cascade_analyzer(**kwargs):
+        analyzer = TransitionAnalyzer(prompt_generator=raw_prompt)
+        analyzer.llm_caller = LoadBalancedCaller(["http://gpu1/v1", "http://gpu2/v1"],
+                                                 caller_factory=lambda base_url: StubLLM(significance=7))
+        analyzer.escalation_llm_caller = StubLLM()
+        return analyzer
+
+    monkeypatch.setattr(cli, "TransitionAnalyzer", cascade_analyzer)
+    monkeypatch.setattr(sys, "stdin", io.StringIO(json.dumps({"id": "a", "text": make_document(0)}) + "\n"))
+
+    assert cli.main(["--max-segment-size", "500", "--overlap-size", "100"]) == 0
+
+    summary = capsys.readouterr().err
+    # Every segment escalates once (borderline significance)
+    assert re.search(r"LLM calls: \{'primary': (\d+), 'escalation': \1\} \| escalations: \{'near_threshold': \1\}",
+                     summary)
+    assert "[primary] http://gpu1/v1: " in summary and "[primary] http://gpu2/v1: " in summary
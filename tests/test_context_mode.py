@@ -0,0 +1,41 @@
+from llm_chunker.text_utils import split_text_into_processing_segments
+
+from tests.stubs import HEADING, SNIPPET_SIZE, StubLLM, expected_chunks, make_chunker, make_document
+
+MAX_SEGMENT_SIZE = 500
+
+
+def _document_with_heading_at_segment_edge():
+    """
+    Find a document where a heading starts so close to the end of an analyzed
+    segment that it is cut off there (and lies in the next segment's context).
+    """
+    for pad in range(200):
+        text = "Preface: " + "intro " * pad + "\n\n" + make_document(0, sections=6)
+        headings = [m.start() for m in HEADING.finditer(text)]
+        for seg, seg_start in split_text_into_processing_segments(text, MAX_SEGMENT_SIZE, 0):
+            seg_end = seg_start + len(seg)
+            edge = [h for h in headings if seg_end - SNIPPET_SIZE < h < seg_end]
+            if edge and seg_end < len(text):
+                return text, edge[0]
+    raise AssertionError("no document with a heading at a segment edge")
+
+
+def test_context_mode_keeps_boundaries_at_segment_edges():
+    text, edge = _document_with_heading_at_segment_edge()
+
+    overlap_chunks = make_chunker(StubLLM(), max_segment_size=MAX_SEGMENT_SIZE).split_text(text)
+    chunks = make_chunker(StubLLM(), max_segment_size=MAX_SEGMENT_SIZE, context_size=200).split_text(text)
+
+    assert chunks == overlap_chunks == expected_chunks(text)
+    assert any(chunk.startswith(text[edge:edge + SNIPPET_SIZE]) for chunk in chunks)
+
+
+def test_rechunk_ignores_points_in_lookahead():
+    text, _ = _document_with_heading_at_segment_edge()
+    chunker = make_chunker(StubLLM(), max_segment_size=MAX_SEGMENT_SIZE, context_size=200)
+
+    chunks, analysis = chunker.split_text(text, return_analysis=True)
+
+    # Re-matching with another threshold must not pick up boundaries owned by the next segment
+    assert chunker.rechunk(analysis, fuzzy_match_threshold=0.9) == chunks
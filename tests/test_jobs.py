@@ -0,0 +1,157 @@
+import multiprocessing
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from llm_chunker import JobQueue, run_worker
+from llm_chunker.jobs import STATUS_DONE, STATUS_FAILED
+
+from tests.stubs import StubLLM, expected_chunks, make_chunker, make_corpus, worker_process
+
+# Separate interpreters, like workers started on several nodes
+_mp = multiprocessing.get_context("spawn")
+
+
+def _run_processes(db_path, specs, lease_seconds=60):
+    procs = [_mp.Process(target=worker_process, args=(db_path, lease_seconds), kwargs=spec) for spec in specs]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(timeout=120)
+    return [p.exitcode for p in procs]
+
+
+def _attempts(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return dict(conn.execute("SELECT doc_id, attempts FROM documents"))
+
+
+def _checkpoints(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+
+
+@pytest.mark.parametrize("journal_mode", ["WAL", "DELETE"])
+def test_processes_share_queue(tmp_path, journal_mode):
+    db_path = str(tmp_path / "corpus.db")
+    corpus = make_corpus(24)
+    queue = JobQueue(db_path, journal_mode=journal_mode)
+    assert queue.add_documents(corpus) == 24
+    assert queue.add_documents(corpus) == 0  # Re-enqueueing is a no-op
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == journal_mode.lower()
+
+    assert _run_processes(db_path, [{"journal_mode": journal_mode}] * 4) == [0] * 4
+
+    assert queue.status_counts()[STATUS_DONE] == 24
+    assert set(_attempts(db_path).values()) == {1}  # Every document processed exactly once
+    assert dict(queue.iter_results()) == {doc_id: expected_chunks(text) for doc_id, text in corpus}
+    assert _checkpoints(db_path) == 0
+
+
+def test_expired_lease_is_taken_over(tmp_path):
+    queue = JobQueue(str(tmp_path / "corpus.db"), lease_seconds=0.2)
+    doc_id, text = make_corpus(1)[0]
+    queue.add_documents([(doc_id, text)])
+
+    assert queue.claim("stalled")[0] == doc_id
+    assert queue.claim("other") is None  # Lease still held
+    time.sleep(0.3)
+
+    assert run_worker(queue, make_chunker(StubLLM()), worker_id="other") == 1
+    # The stalled worker's late result is discarded
+    assert not queue.complete(doc_id, "stalled", ["stale"])
+    assert dict(queue.iter_results()) == {doc_id: expected_chunks(text)}
+
+
+def test_heartbeat_keeps_lease_during_slow_calls(tmp_path):
+    db_path = str(tmp_path / "corpus.db")
+    queue = JobQueue(db_path, lease_seconds=0.3)
+    doc_id, text = make_corpus(1)[0]
+    queue.add_documents([(doc_id, text)])
+
+    # Every LLM call outlives the lease
+    worker = threading.Thread(target=run_worker, args=(queue, make_chunker(StubLLM(delay=0.5))))
+    worker.start()
+    for _ in range(4):  # Inside the first call, past its initial lease
+        time.sleep(0.1)
+        assert queue.claim("other") is None
+    worker.join()
+
+    assert _attempts(db_path) == {doc_id: 1}
+    assert dict(queue.iter_results()) == {doc_id: expected_chunks(text)}
+
+
+def test_resume_from_checkpoints(tmp_path):
+    db_path = str(tmp_path / "corpus.db")
+    doc_id, text = make_corpus(1, sections=8)[0]
+    queue = JobQueue(db_path, lease_seconds=0.5)
+    queue.add_documents([(doc_id, text)])
+
+    reference = StubLLM()
+    make_chunker(reference).split_text(text)
+
+    # The worker process dies after analyzing two segments
+    assert _run_processes(db_path, [{"exit_after": 2}], lease_seconds=0.5) == [1]
+    assert _checkpoints(db_path) == 2
+    time.sleep(0.6)
+
+    llm = StubLLM()
+    assert run_worker(queue, make_chunker(llm)) == 1
+    assert llm.calls == reference.calls - 2
+    assert dict(queue.iter_results()) == {doc_id: expected_chunks(text)}
+
+
+def test_unknown_journal_mode_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        JobQueue(str(tmp_path / "corpus.db"), journal_mode="MEMORY")
+
+
+def test_expired_lease_on_last_attempt_fails(tmp_path):
+    queue = JobQueue(str(tmp_path / "corpus.db"), lease_seconds=0.1, max_attempts=2)
+    queue.add_documents(make_corpus(1))
+
+    # A document that kills its worker every time
+    for _ in range(2):
+        assert queue.claim("doomed") is not None
+        time.sleep(0.2)
+
+    assert queue.claim("next") is None
+    assert queue.status_counts()[STATUS_FAILED] == 1
+
+
+def test_failed_llm_calls_are_not_checkpointed(tmp_path):
+    db_path = str(tmp_path / "corpus.db")
+    doc_id, text = make_corpus(1)[0]
+    queue = JobQueue(db_path, max_attempts=1)
+    queue.add_documents([(doc_id, text)])
+
+    assert run_worker(queue, make_chunker(StubLLM(fail=True))) == 0
+    assert queue.status_counts()[STATUS_FAILED] == 1
+    assert _checkpoints(db_path) == 0
+
+    assert queue.retry_failed() == 1
+    assert run_worker(queue, make_chunker(StubLLM())) == 1
+    assert dict(queue.iter_results()) == {doc_id: expected_chunks(text)}
+
+
+def test_broken_worker_does_not_complete_documents(tmp_path):
+    db_path = str(tmp_path / "corpus.db")
+    corpus = make_corpus(40)
+    expected = {doc_id: expected_chunks(text) for doc_id, text in corpus}
+    queue = JobQueue(db_path)
+    queue.add_documents(corpus)
+
+    # One of four workers talks to an endpoint that always fails
+    assert _run_processes(db_path, [{"fail": True}] + [{}] * 3) == [0] * 4
+
+    # Documents are either done correctly or failed (never done with an unsplit chunk)
+    counts = queue.status_counts()
+    assert counts[STATUS_DONE] + counts[STATUS_FAILED] == 40
+    assert all(chunks == expected[doc_id] for doc_id, chunks in queue.iter_results())
+
+    queue.retry_failed()
+    run_worker(queue, make_chunker(StubLLM()))
+    assert dict(queue.iter_results()) == expected
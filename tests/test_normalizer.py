@@ -0,0 +1,66 @@
+import pytest
+
+from llm_chunker import TextNormalizer
+
+from tests.stubs import HEADING, StubLLM, make_chunker, make_document
+
+HEADER = r"^ACME Corp\. Annual Report - page \d+$"
+
+
+def _pdf_style(text: str) -> str:
+    """Hard-wrap lines, double some spaces and insert running page headers like PDF extraction does."""
+    lines, page = [], 1
+    for paragraph in text.split("\n\n"):
+        words = paragraph.split(" ")
+        for i in range(0, len(words), 8):
+            lines.append(" ".join(words[i:i + 2]) + "  " + "  ".join(words[i + 2:i + 5]) + " "
+                         + " ".join(words[i + 5:i + 8]) + "   ")
+            if len(lines) % 5 == 0:
+                lines.append(f"ACME Corp. Annual Report - page {page}")
+                page += 1
+        lines.append("")
+    return "\n".join(lines)
+
+
+SAMPLES = [
+    "plain text without anything to collapse",
+    "  leading   and trailing\t\twhitespace  \n",
+    "first paragraph\n\n\n   second\tparagraph\n  third line",
+    _pdf_style(make_document(0, sections=3)),
+]
+CONFIGS = [
+    {},
+    {"noise_patterns": [HEADER]},
+    {"noise_patterns": [HEADER, r"^\s*- \d+ -\s*$"]},
+    {"collapse_whitespace": False, "noise_patterns": [HEADER]},
+]
+
+
+@pytest.mark.parametrize("config", CONFIGS)
+@pytest.mark.parametrize("original", SAMPLES)
+def test_offsets_round_trip(original, config):
+    normalized, offset_map = TextNormalizer(**config).normalize(original)
+
+    for i, char in enumerate(normalized):
+        if not char.isspace():
+            assert original[offset_map.to_original(i)] == char
+
+
+def test_noise_is_removed_from_payload():
+    original = _pdf_style(make_document(0, sections=3))
+    normalized, _ = TextNormalizer(noise_patterns=[HEADER]).normalize(original)
+
+    assert "ACME Corp" in original and "ACME Corp" not in normalized
+    assert "  " not in normalized
+
+
+def test_normalized_split_matches_original_offsets():
+    text = _pdf_style(make_document(0, sections=6))
+    assert len(HEADING.findall(text)) == 6
+
+    plain = make_chunker(StubLLM()).split_text(text)
+    normalized = make_chunker(StubLLM(), normalizer=TextNormalizer(noise_patterns=[HEADER])).split_text(text)
+
+    assert normalized == plain
+    assert len(plain) == 6
+    assert all(HEADING.match(chunk) for chunk in plain)
@@ -0,0 +1,58 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from llm_chunker import GenericChunker, TransitionAnalyzer
+
+from tests.stubs import StubLLM, make_chunker, make_corpus, raw_prompt
+
+
+class MalformedPrimary(StubLLM):
+    """Cheap tier that returns unparseable output for some segments (deterministic by content)."""
+    def __call__(self, prompt: str) -> str:
+        if "Section 3" in prompt or "Section 7" in prompt:
+            super().__call__(prompt)
+            return "transition_points: none"
+        return super().__call__(prompt)
+
+
+def _cascade_chunker() -> GenericChunker:
+    analyzer = TransitionAnalyzer(prompt_generator=raw_prompt)
+    analyzer.llm_caller = MalformedPrimary(delay=0.001)
+    analyzer.escalation_llm_caller = StubLLM(delay=0.001)
+    return GenericChunker(analyzer=analyzer, max_segment_size=500, overlap_size=100, thread_safe=True)
+
+
+def test_shared_instance_matches_serial_use():
+    chunker = _cascade_chunker()
+    texts = [text for _, text in make_corpus(200)]
+
+    serial = [chunker.split_text(text, return_analysis=True) for text in texts]
+    serial_stats = chunker.analyzer.get_stats()
+    chunker.analyzer.reset_stats()
+
+    with ThreadPoolExecutor(32) as pool:
+        parallel = list(pool.map(lambda text: chunker.split_text(text, return_analysis=True), texts))
+
+    for (chunks, analysis), (p_chunks, p_analysis) in zip(serial, parallel):
+        assert p_chunks == chunks
+        assert p_analysis["stats"] == analysis["stats"]
+        assert p_analysis["segments"] == analysis["segments"]
+
+    # Cumulative statistics add up to the per-call statistics
+    assert chunker.analyzer.get_stats() == serial_stats
+    assert serial_stats["escalation_reasons"] == {"parse_failure": sum(
+        analysis["stats"]["escalation_reasons"].get("parse_failure", 0) for _, analysis in serial)}
+    assert serial_stats["escalation_reasons"]["parse_failure"] > 0
+
+
+def test_configuration_is_frozen():
+    chunker = make_chunker(StubLLM(), thread_safe=True)
+    with pytest.raises(AttributeError):
+        chunker.significance_threshold = 3
+
+
+@pytest.mark.parametrize("option", ["verbose", "show_progress"])
+def test_global_side_effects_are_rejected(option):
+    with pytest.raises(ValueError):
+        make_chunker(StubLLM(), thread_safe=True, **{option: True})